@@ -0,0 +1,139 @@
+"""Benchmark compressed deal bodies on a large synthetic corpus.
+
+Builds the same synthetic deals table three ways (plain text, zlib, zlib
+with a trained dictionary) and reports database size plus lookup latency
+for full-row lookups (what every lookup did before bodies became lazy),
+metadata-only lookups and metadata plus on-demand body decompression.
+
+Usage:
+    python benchmarks/bench_compression.py [--deals 50000] [--lookups 2000]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from cli_saver_deals_agent.compression import train_dictionary  # noqa: E402
+from cli_saver_deals_agent.database import (  # noqa: E402
+    find_deal_by_package,
+    get_deal_text,
+    init_db,
+    insert_deal,
+    open_readonly,
+    store_dictionary,
+)
+
+
+TEMPLATES = [
+    "Get {months} months of free access to enterprise tools on app.{name}.com\nAccess code: {code}",
+    "Official hackathon promo code:\n{code}\n\n${value} in credits",
+    "Request access to confirm participation:\n\nIt may take 24-48 hours for credits to populate "
+    "on your account:\nhttps://docs.google.com/forms/d/{token}/viewform\n\n${value} in credits",
+    "New Plus subscribers receive a {days}-day FREE trial\nUpgrade page: https://app.{name}.dev/pricing",
+    "{days} days FREE access\nActivate here:\nhttps://buy.stripe.com/{token}",
+    "Apply for access here:\nhttps://docs.google.com/forms/d/e/{token}/viewform\n\n"
+    "Works for technical and non-technical teams via the app or libraries.",
+]
+
+
+def synthetic_deals(count: int, rng: random.Random) -> list[dict]:
+    """Generate deal rows that look like real seed file entries."""
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    deals = []
+    for i in range(count):
+        name = f"product{i}"
+        text = rng.choice(TEMPLATES).format(
+            name=name,
+            months=rng.randint(1, 12),
+            days=rng.choice([30, 60, 90]),
+            value=rng.choice([25, 50, 100, 250, 1000]),
+            code="".join(rng.choice(alphabet[26:]) for _ in range(rng.randint(6, 16))),
+            token="".join(rng.choice(alphabet) for _ in range(40)),
+        )
+        deals.append({"product_name": f"Product {i}", "package_name": f"pkg-{i}", "raw_text": text})
+    return deals
+
+
+def build(path: Path, deals: list[dict], compress: bool, with_dictionary: bool) -> Path:
+    """Build a deals database and return its path."""
+    conn = init_db(path)
+    conn.execute("PRAGMA synchronous = OFF")
+
+    dict_id = zdict = None
+    if with_dictionary:
+        zdict = train_dictionary([deal["raw_text"] for deal in deals])
+        dict_id = store_dictionary(conn, zdict)
+
+    for deal in deals:
+        insert_deal(
+            conn,
+            product_name=deal["product_name"],
+            raw_text=deal["raw_text"],
+            package_name=deal["package_name"],
+            package_manager="pip",
+            compress=compress,
+            dict_id=dict_id,
+            zdict=zdict,
+        )
+    conn.execute("VACUUM")
+    conn.close()
+    return path
+
+
+def latency_us(func, names: list[str]) -> float:
+    """Get the median latency of `func(name)` in microseconds."""
+    samples = []
+    for name in names:
+        start = time.perf_counter()
+        func(name)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deals", type=int, default=50000, help="Number of synthetic deals")
+    parser.add_argument("--lookups", type=int, default=2000, help="Number of timed lookups per variant")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    deals = synthetic_deals(args.deals, rng)
+    names = [f"pkg-{rng.randrange(args.deals)}" for _ in range(args.lookups)]
+    text_bytes = sum(len(deal["raw_text"].encode()) for deal in deals)
+    print(f"{args.deals} deals, {text_bytes / 1e6:.1f} MB of body text\n")
+
+    variants = [
+        ("plain", False, False),
+        ("zlib", True, False),
+        ("zlib+dict", True, True),
+    ]
+    print(f"{'storage':<10} {'db MB':>7} {'full row us':>12} {'metadata us':>12} {'meta+text us':>13}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, compress, with_dictionary in variants:
+            path = build(Path(tmp) / f"{label}.db", deals, compress, with_dictionary)
+            size_mb = path.stat().st_size / 1e6
+
+            conn = open_readonly(path)
+            full = latency_us(lambda name: find_deal_by_package(conn, name, with_text=True), names)
+            meta = latency_us(lambda name: find_deal_by_package(conn, name), names)
+            lazy = latency_us(
+                lambda name: get_deal_text(conn, find_deal_by_package(conn, name)["id"]),
+                names,
+            )
+            conn.close()
+
+            print(f"{label:<10} {size_mb:>7.2f} {full:>12.1f} {meta:>12.1f} {lazy:>13.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
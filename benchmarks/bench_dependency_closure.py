@@ -0,0 +1,112 @@
+"""Benchmark dependency closure computation for `wrap --deps`.
+
+Times building the dependency graph of the current Python environment
+from installed metadata, computing closures over synthetic graphs of
+increasing size, filtering a closure against the packages already shown
+(once from a single installed.json load, and per name as before), and
+the batched deal lookup for a closure's worth of names.
+
+Usage:
+    python benchmarks/bench_dependency_closure.py [--sizes 1000,10000,100000] [--fanout 6]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from cli_saver.config import get_installed_path, is_package_seen  # noqa: E402
+from cli_saver.deps import dependency_closure, python_dependency_graph  # noqa: E402
+from cli_saver.wrapper import unseen_packages  # noqa: E402
+from cli_saver_deals_agent.database import find_deals_by_packages, init_db, insert_deal  # noqa: E402
+
+
+# Largest closure to time the per-name seen check on
+PER_NAME_LIMIT = 5000
+
+
+def timed(func, repeat: int = 5) -> float:
+    """Get the median wall time of `func` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def synthetic_graph(size: int, fanout: int, rng: random.Random) -> dict[str, set[str]]:
+    """Build a random DAG where each package depends on later packages."""
+    graph = {}
+    for i in range(size):
+        n_deps = min(rng.randint(0, fanout * 2), size - i - 1)
+        graph[f"pkg-{i}"] = {f"pkg-{rng.randint(i + 1, size - 1)}" for _ in range(n_deps)}
+    return graph
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated synthetic graph sizes")
+    parser.add_argument("--fanout", type=int, default=6, help="Average direct dependencies per package")
+    parser.add_argument("--roots", type=int, default=5, help="Top-level packages per install")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    graph = python_dependency_graph()
+    closure = dependency_closure(list(graph)[:args.roots], graph)
+    print(f"current environment: {len(graph)} distributions")
+    print(f"  build graph from metadata: {timed(python_dependency_graph):8.2f} ms")
+    print(f"  closure of {args.roots} roots ({len(closure)} names): "
+          f"{timed(lambda: dependency_closure(list(graph)[:args.roots], graph)):8.3f} ms")
+
+    print(f"\n{'packages':>9} {'edges':>9} {'closure':>8} {'closure ms':>11} "
+          f"{'filter ms':>10} {'per-name ms':>12} {'lookup ms':>10}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        graph = synthetic_graph(size, args.fanout, rng)
+        edges = sum(len(deps) for deps in graph.values())
+        roots = [f"pkg-{rng.randint(0, size // 10)}" for _ in range(args.roots)]
+        closure = dependency_closure(roots, graph)
+        closure_ms = timed(lambda: dependency_closure(roots, graph))
+
+        names = sorted(closure)
+        with tempfile.TemporaryDirectory() as tmp:
+            # Half the closure has already been shown, as in a long-lived environment
+            old_home = os.environ.get("HOME")
+            os.environ["HOME"] = tmp
+            try:
+                get_installed_path().write_text(json.dumps({"pip": names[::2]}))
+                filter_ms = timed(lambda: unseen_packages("pip", names))
+                # The old per-name check reparses installed.json each time; skip it when huge
+                per_name_ms = None
+                if len(names) <= PER_NAME_LIMIT:
+                    per_name_ms = timed(lambda: [n for n in names if not is_package_seen("pip", n)], repeat=1)
+            finally:
+                if old_home is None:
+                    del os.environ["HOME"]
+                else:
+                    os.environ["HOME"] = old_home
+
+            # One deal for every 50th package, then look the whole closure up
+            conn = init_db(Path(tmp) / "deals.db")
+            for i in range(0, size, 50):
+                insert_deal(conn, f"Product {i}", f"Deal {i}", package_name=f"pkg-{i}", package_manager="pip")
+            lookup_ms = timed(lambda: find_deals_by_packages(conn, names))
+            conn.close()
+
+        per_name = "-" if per_name_ms is None else f"{per_name_ms:.2f}"
+        print(f"{size:>9} {edges:>9} {len(closure):>8} {closure_ms:>11.2f} "
+              f"{filter_ms:>10.2f} {per_name:>12} {lookup_ms:>10.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
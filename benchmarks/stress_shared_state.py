@@ -0,0 +1,170 @@
+"""Concurrency stress harness for shared ~/.cli-saver state.
+
+Launches N concurrent `wrap_command("pip", ["install", ...])` processes
+under one throwaway home directory, against a fake `pip` that just sleeps
+and exits 0, and checks the shared state afterwards:
+
+- lost seen-updates: a deal was displayed but its package is missing
+  from installed.json
+- corrupted JSON: a process failed to parse installed.json/config.json,
+  or the final file doesn't parse
+- "database is locked" errors from deals.db
+- duplicate displays: the same deal shown by more than one process
+
+It also reports throughput and latency percentiles as N grows.
+
+Usage:
+    python benchmarks/stress_shared_state.py [--workers 1,2,4,8,16,32] [--packages 12] [--per-install 4]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+FAKE_PIP = """#!/bin/sh
+# Fake package manager: pretend to install for a few milliseconds
+sleep 0.0$(( $$ % 5 ))
+exit 0
+"""
+
+WORKER = """
+import sys
+from cli_saver.wrapper import wrap_command
+sys.exit(wrap_command("pip", sys.argv[1:]))
+"""
+
+DISPLAY_PATTERN = re.compile(r"Found deal for (stress-product-\d+)!")
+
+
+def make_home(root: Path, n_packages: int) -> dict:
+    """Create a home directory with a seeded deals DB and a fake pip."""
+    home = root / "home"
+    home.mkdir()
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    fake_pip = bin_dir / "pip"
+    fake_pip.write_text(FAKE_PIP)
+    fake_pip.chmod(0o755)
+
+    env = dict(os.environ)
+    env["HOME"] = str(home)
+    env["PATH"] = f"{bin_dir}{os.pathsep}{env.get('PATH', '')}"
+    env["PYTHONPATH"] = f"{REPO_ROOT}{os.pathsep}{env.get('PYTHONPATH', '')}"
+    env["COLUMNS"] = "200"
+    env.pop("CLI_SAVER_SESSION", None)
+
+    seed = (
+        "import sys\n"
+        "from cli_saver_deals_agent.database import init_db, insert_deal\n"
+        "conn = init_db()\n"
+        "for i in range(int(sys.argv[1])):\n"
+        "    insert_deal(conn, product_name=f'stress-product-{i}',\n"
+        "                raw_text=f'Deal body {i}', package_name=f'stress-pkg-{i}',\n"
+        "                package_manager='pip')\n"
+        "conn.close()\n"
+    )
+    subprocess.run([sys.executable, "-c", seed, str(n_packages)], env=env, check=True)
+    return env
+
+
+def run_round(n_workers: int, n_packages: int, per_install: int, rng: random.Random) -> dict:
+    """Run one round of N concurrent installs and check the shared state."""
+    with tempfile.TemporaryDirectory(prefix="cli-saver-stress-") as tmp:
+        env = make_home(Path(tmp), n_packages)
+        pool = [f"stress-pkg-{i}" for i in range(n_packages)]
+
+        procs = []
+        start = time.perf_counter()
+        for _ in range(n_workers):
+            packages = rng.sample(pool, min(per_install, n_packages))
+            proc = subprocess.Popen(
+                [sys.executable, "-c", WORKER, "install", *packages],
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            procs.append((time.perf_counter(), proc))
+
+        latencies = []
+        outputs = []
+        failures = 0
+        for started, proc in procs:
+            stdout, stderr = proc.communicate()
+            latencies.append(time.perf_counter() - started)
+            outputs.append(stdout + stderr)
+            if proc.returncode != 0:
+                failures += 1
+        elapsed = time.perf_counter() - start
+
+        displays = Counter()
+        for output in outputs:
+            for product in DISPLAY_PATTERN.findall(output):
+                displays[product.replace("stress-product-", "stress-pkg-")] += 1
+
+        combined = "\n".join(outputs)
+        locked = combined.count("database is locked")
+        json_errors = combined.count("JSONDecodeError")
+
+        installed_path = Path(env["HOME"]) / ".cli-saver" / "installed.json"
+        try:
+            seen = set(json.loads(installed_path.read_text()).get("pip", []))
+        except (OSError, ValueError):
+            seen = set()
+            json_errors += 1
+
+        return {
+            "workers": n_workers,
+            "elapsed": elapsed,
+            "throughput": n_workers / elapsed,
+            "p50": statistics.median(latencies),
+            "p95": sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)],
+            "failures": failures,
+            "locked": locked,
+            "json_errors": json_errors,
+            "lost_updates": len(set(displays) - seen),
+            "duplicates": sum(count - 1 for count in displays.values()),
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4,8,16,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--packages", type=int, default=12, help="Number of packages with deals")
+    parser.add_argument("--per-install", type=int, default=4, help="Packages per install command")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for package selection")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    header = f"{'N':>4} {'wall s':>8} {'inst/s':>8} {'p50 s':>7} {'p95 s':>7} {'fail':>5} {'locked':>7} {'json':>5} {'lost':>5} {'dup':>5}"
+    print(header)
+    print("-" * len(header))
+
+    problems = 0
+    for n_workers in (int(n) for n in args.workers.split(",")):
+        r = run_round(n_workers, args.packages, args.per_install, rng)
+        print(
+            f"{r['workers']:>4} {r['elapsed']:>8.2f} {r['throughput']:>8.1f} "
+            f"{r['p50']:>7.3f} {r['p95']:>7.3f} {r['failures']:>5} {r['locked']:>7} "
+            f"{r['json_errors']:>5} {r['lost_updates']:>5} {r['duplicates']:>5}"
+        )
+        problems += r["failures"] + r["locked"] + r["json_errors"] + r["lost_updates"] + r["duplicates"]
+
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,14 @@ import click
 from rich.console import Console
 
 from .wrapper import wrap_command
+from .managers import available_managers, get_manager
 from .config import (
     set_nevermined_api_key,
     set_proxlock_api_key,
     get_nevermined_api_key,
     get_proxlock_api_key,
+    get_deal_layers,
+    set_deal_layers,
 )
 
 
@@ -22,16 +25,62 @@ def main():
     pass
 
 
-@main.command()
-@click.argument("package_manager", type=click.Choice(["pip", "brew", "npm"]))
-@click.argument("args", nargs=-1)
+@main.command(context_settings={"ignore_unknown_options": True, "allow_interspersed_args": False})
+@click.argument("package_manager")
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
 @click.option("--dry-run", is_flag=True, help="Don't execute the command, just show what would happen")
-def wrap(package_manager: str, args: tuple, dry_run: bool):
+@click.option("--detach", is_flag=True, help="Check for deals in the background and show them at the next prompt")
+@click.option("--deps", is_flag=True, help="Also check dependencies the install pulled in")
+@click.option("--all-deals", is_flag=True, help="Show every deal for a package, not just the best one")
+def wrap(package_manager: str, args: tuple, dry_run: bool, detach: bool, deps: bool, all_deals: bool):
     """Wrap a package manager command and check for deals."""
-    exit_code = wrap_command(package_manager, list(args), dry_run=dry_run)
+    if get_manager(package_manager) is None:
+        raise click.BadParameter(
+            f"{package_manager!r} is not a supported package manager "
+            f"(choose from {', '.join(available_managers())})",
+            param_hint="PACKAGE_MANAGER",
+        )
+
+    exit_code = wrap_command(
+        package_manager,
+        list(args),
+        dry_run=dry_run,
+        detach=detach,
+        deps=deps,
+        all_deals=all_deals,
+    )
     sys.exit(exit_code)
 
 
+@main.command()
+@click.argument("package")
+@click.option("--manager", default=None, help="Normalize PACKAGE the way this package manager's wrapper does")
+def deals(package: str, manager: str):
+    """Show every active deal for a package, best first.
+
+    Uses the same ranking, expiry filter and team layers as the wrapper.
+    """
+    from datetime import date
+    from cli_saver_deals_agent.database import package_key
+    from .display import display_deal
+    from .lookup import lookup_top_deals
+
+    if manager is not None and get_manager(manager) is None:
+        raise click.BadParameter(
+            f"{manager!r} is not a supported package manager "
+            f"(choose from {', '.join(available_managers())})",
+            param_hint="--manager",
+        )
+
+    key = package_key(package, manager)
+    ranked = lookup_top_deals([key], k=None, active_on=date.today().isoformat()).get(key) if key else None
+    if not ranked:
+        console.print(f"No active deals for {package}.")
+        return
+    for deal in ranked:
+        display_deal(deal)
+
+
 @main.command()
 def setup():
     """Set up cli-saver with API keys."""
@@ -70,7 +119,9 @@ def setup():
 
 @main.command("shell-init")
 @click.option("--shell", type=click.Choice(["bash", "zsh", "fish"]), default=None, help="Shell type")
-def shell_init(shell: str):
+@click.option("--detach", is_flag=True, help="Check for deals in the background instead of after each install")
+@click.option("--deps", is_flag=True, help="Also check dependencies each install pulls in")
+def shell_init(shell: str, detach: bool, deps: bool):
     """Output shell configuration to set up aliases."""
     import os
 
@@ -84,27 +135,61 @@ def shell_init(shell: str):
         else:
             shell = "bash"
 
-    if shell == "fish":
-        config = """
-# CLI Saver aliases
-function pip
-    cli-saver wrap pip $argv
-end
-
-function brew
-    cli-saver wrap brew $argv
-end
+    managers = available_managers()
+    wrap_cmd = "cli-saver wrap"
+    if detach:
+        wrap_cmd += " --detach"
+    if deps:
+        wrap_cmd += " --deps"
 
-function npm
-    cli-saver wrap npm $argv
+    # The prompt hook prints deals found by background checks. It only
+    # globs the session's spool directory, so it costs nothing when empty.
+    if shell == "fish":
+        config = "\n# CLI Saver aliases\n"
+        for name in managers:
+            config += f"function {name}\n    {wrap_cmd} {name} $argv\nend\n\n"
+        config += """# CLI Saver deal notifications
+set -gx CLI_SAVER_SESSION "$hostname-$fish_pid"
+function _cli_saver_precmd --on-event fish_prompt
+    for f in $HOME/.cli-saver/spool/$CLI_SAVER_SESSION/*.txt
+        cat $f; and rm -f $f
+    end
 end
+"""
+    elif shell == "zsh":
+        config = "\n# CLI Saver aliases\n"
+        for name in managers:
+            config += f'{name}() {{ {wrap_cmd} {name} "$@"; }}\n'
+        config += """
+# CLI Saver deal notifications
+export CLI_SAVER_SESSION="${HOST:-$(hostname)}-$$"
+_cli_saver_precmd() {
+    local f
+    for f in "$HOME/.cli-saver/spool/$CLI_SAVER_SESSION"/*.txt(N); do
+        cat "$f" && rm -f "$f"
+    done
+}
+autoload -Uz add-zsh-hook
+add-zsh-hook precmd _cli_saver_precmd
 """
     else:
-        config = """
-# CLI Saver aliases
-pip() { cli-saver wrap pip "$@"; }
-brew() { cli-saver wrap brew "$@"; }
-npm() { cli-saver wrap npm "$@"; }
+        config = "\n# CLI Saver aliases\n"
+        for name in managers:
+            config += f'{name}() {{ {wrap_cmd} {name} "$@"; }}\n'
+        config += """
+# CLI Saver deal notifications
+export CLI_SAVER_SESSION="${HOSTNAME:-$(hostname)}-$$"
+_cli_saver_precmd() {
+    local f
+    for f in "$HOME/.cli-saver/spool/$CLI_SAVER_SESSION"/*.txt; do
+        [ -e "$f" ] || continue
+        cat "$f" && rm -f "$f"
+    done
+}
+case "$PROMPT_COMMAND" in
+    *_cli_saver_precmd*) ;;
+    *) PROMPT_COMMAND="_cli_saver_precmd${PROMPT_COMMAND:+;$PROMPT_COMMAND}" ;;
+esac
 """
 
     click.echo(config)
@@ -128,8 +213,81 @@ def status():
     else:
         console.print("[yellow]○[/yellow] Proxlock: Not configured")
 
+    layers = get_deal_layers()
+    if layers:
+        console.print(f"[green]✓[/green] Team deal layers: {len(layers)}")
+        for layer in layers:
+            marker = "" if layer.is_file() else " [yellow](missing)[/yellow]"
+            console.print(f"    {layer}{marker}")
+
     console.print("\nRun [cyan]cli-saver setup[/cyan] to configure integrations.")
     console.print("Run [cyan]source <(cli-saver shell-init)[/cyan] to enable package manager wrapping.")
+    console.print("Add [cyan]--detach[/cyan] to check for deals in the background and show them at the next prompt.")
+
+
+@main.command()
+@click.argument("paths", nargs=-1, type=click.Path(dir_okay=False))
+@click.option("--clear", is_flag=True, help="Stop using team deal databases")
+def layers(paths: tuple, clear: bool):
+    """Set read-only team deal databases to check after your own.
+
+    Earlier PATHS take precedence over later ones; your own deals always
+    win. Set CLI_SAVER_DEAL_LAYERS to override per shell.
+    """
+    if clear:
+        set_deal_layers([])
+        console.print("[green]✓[/green] Team deal layers cleared")
+        return
+
+    if paths:
+        set_deal_layers(list(paths))
+
+    current = get_deal_layers()
+    if not current:
+        console.print("No team deal layers configured.")
+        return
+    for rank, layer in enumerate(current, 1):
+        marker = "" if layer.is_file() else " [yellow](missing)[/yellow]"
+        console.print(f"{rank}. {layer}{marker}")
+
+
+@main.command()
+@click.option("--days", type=click.IntRange(min=1), default=14, show_default=True, help="Number of recent days to show")
+@click.option("--compact-after", type=click.IntRange(min=1), default=30, show_default=True, help="Compact event log segments older than this many days")
+def report(days: int, compact_after: int):
+    """Show how often deals were shown, tipped and saved."""
+    from rich.table import Table
+    from .events import COUNTERS, compact, rollup_events
+
+    compacted = compact(compact_after)
+    totals = rollup_events()
+
+    if not totals["packages"]:
+        console.print("[yellow]No deal events recorded yet.[/yellow]")
+        return
+
+    headers = ["Shown", "Re-shown", "Tipped", "Declined", "Saved"]
+
+    by_package = Table(title="Deals by package")
+    by_package.add_column("Package", style="cyan")
+    for header in headers:
+        by_package.add_column(header, justify="right")
+    for package, counts in sorted(totals["packages"].items()):
+        by_package.add_row(package, *(str(counts[name]) for name in COUNTERS))
+
+    by_day = Table(title=f"Deals by day (last {days})")
+    by_day.add_column("Day", style="cyan")
+    for header in headers:
+        by_day.add_column(header, justify="right")
+    for day, counts in sorted(totals["days"].items())[-days:]:
+        by_day.add_row(day, *(str(counts[name]) for name in COUNTERS))
+
+    console.print(by_package)
+    console.print()
+    console.print(by_day)
+
+    if compacted:
+        console.print(f"\n[dim]Compacted {compacted} old event log segments[/dim]")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,18 @@
 """Configuration management for cli-saver."""
 
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+DEAL_LAYERS_ENV = "CLI_SAVER_DEAL_LAYERS"
 
 
 def get_config_dir() -> Path:
@@ -22,6 +32,37 @@ def get_installed_path() -> Path:
     return get_config_dir() / "installed.json"
 
 
+def get_lock_path() -> Path:
+    """Get the path to the lock file guarding config/installed updates."""
+    return get_config_dir() / "state.lock"
+
+
+@contextmanager
+def state_lock() -> Iterator[None]:
+    """Hold an exclusive lock while reading-modifying-writing state files.
+
+    Parallel installs (e.g. CI steps sharing a home directory) would
+    otherwise lose each other's updates.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with open(get_lock_path(), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write JSON via a temp file and rename, so readers never see a partial file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2))
+    os.replace(tmp_path, path)
+
+
 def load_config() -> dict:
     """Load configuration from disk."""
     config_path = get_config_path()
@@ -32,8 +73,7 @@ def load_config() -> dict:
 
 def save_config(config: dict) -> None:
     """Save configuration to disk."""
-    config_path = get_config_path()
-    config_path.write_text(json.dumps(config, indent=2))
+    write_json_atomic(get_config_path(), config)
 
 
 def get_nevermined_api_key() -> Optional[str]:
@@ -48,16 +88,38 @@ def get_proxlock_api_key() -> Optional[str]:
 
 def set_nevermined_api_key(api_key: str) -> None:
     """Set the Nevermined API key."""
-    config = load_config()
-    config["nevermined_api_key"] = api_key
-    save_config(config)
+    with state_lock():
+        config = load_config()
+        config["nevermined_api_key"] = api_key
+        save_config(config)
 
 
 def set_proxlock_api_key(api_key: str) -> None:
     """Set the Proxlock API key."""
-    config = load_config()
-    config["proxlock_api_key"] = api_key
-    save_config(config)
+    with state_lock():
+        config = load_config()
+        config["proxlock_api_key"] = api_key
+        save_config(config)
+
+
+def get_deal_layers() -> list[Path]:
+    """Get the read-only team deal databases to layer under the user's.
+
+    CLI_SAVER_DEAL_LAYERS (paths separated like PATH) overrides the
+    "deal_layers" config list.
+    """
+    env_layers = os.environ.get(DEAL_LAYERS_ENV)
+    if env_layers is not None:
+        return [Path(path) for path in env_layers.split(os.pathsep) if path]
+    return [Path(path) for path in load_config().get("deal_layers", [])]
+
+
+def set_deal_layers(paths: list[str]) -> None:
+    """Set the team deal databases, in precedence order."""
+    with state_lock():
+        config = load_config()
+        config["deal_layers"] = [str(Path(path).expanduser().resolve()) for path in paths]
+        save_config(config)
 
 
 def load_installed() -> dict:
@@ -70,18 +132,32 @@ def load_installed() -> dict:
 
 def save_installed(installed: dict) -> None:
     """Save the installed packages tracking."""
-    installed_path = get_installed_path()
-    installed_path.write_text(json.dumps(installed, indent=2))
+    write_json_atomic(get_installed_path(), installed)
 
 
-def mark_package_seen(package_manager: str, package_name: str) -> None:
-    """Mark a package as seen (we've shown the deal for it)."""
-    installed = load_installed()
-    if package_manager not in installed:
-        installed[package_manager] = []
-    if package_name not in installed[package_manager]:
+def mark_package_seen(package_manager: str, package_name: str) -> bool:
+    """Mark a package as seen (we've shown the deal for it).
+
+    Returns True if this call marked it, False if it was already seen, so
+    concurrent installs can use it to claim a deal before displaying it.
+    """
+    with state_lock():
+        installed = load_installed()
+        if package_manager not in installed:
+            installed[package_manager] = []
+        if package_name in installed[package_manager]:
+            return False
         installed[package_manager].append(package_name)
         save_installed(installed)
+        return True
+
+
+def seen_packages(package_manager: str) -> set[str]:
+    """Get every package we've already shown a deal for under a manager.
+
+    Loads installed.json once, for filtering many names at a time.
+    """
+    return set(load_installed().get(package_manager, []))
 
 
 def is_package_seen(package_manager: str, package_name: str) -> bool:
@@ -0,0 +1,147 @@
+"""Dependency graphs for finding deals on transitively installed packages.
+
+Each function returns a graph mapping a normalized package name to the
+set of names it depends on, built from data that's already on disk:
+installed distribution metadata for Python, package-lock.json for npm and
+`brew deps` output for Homebrew.
+"""
+
+import json
+import re
+import subprocess
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    from packaging.markers import Marker
+except ImportError:  # pragma: no cover - packaging is nearly always around
+    Marker = None
+
+
+# Name at the start of a PEP 508 requirement string
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+EXTRA_MARKER = re.compile(r"\bextra\s*==")
+NAME_SEPARATOR = re.compile(r"[-_.]+")
+
+
+def normalize_python_name(name: str) -> str:
+    """Normalize a Python distribution name (PEP 503)."""
+    return NAME_SEPARATOR.sub("-", name).lower()
+
+
+def marker_applies(marker: str) -> bool:
+    """Check whether a PEP 508 environment marker holds for this install.
+
+    Markers are evaluated against the running interpreter with no extras
+    selected. Without `packaging`, only extra markers are recognized; any
+    other marker is assumed to hold.
+    """
+    if Marker is None:
+        return not EXTRA_MARKER.search(marker)
+    try:
+        return Marker(marker).evaluate({"extra": ""})
+    except ValueError:  # invalid marker or undefined name
+        return not EXTRA_MARKER.search(marker)
+
+
+def dependency_closure(roots: Iterable[str], graph: dict[str, set[str]]) -> set[str]:
+    """Get the roots plus everything they depend on, directly or not."""
+    seen = set()
+    queue = deque(roots)
+    while queue:
+        name = queue.popleft()
+        if name in seen:
+            continue
+        seen.add(name)
+        queue.extend(graph.get(name, ()))
+    return seen
+
+
+def python_dependency_graph(paths: Optional[list[str]] = None) -> dict[str, set[str]]:
+    """Build the dependency graph of installed Python distributions.
+
+    Requirements whose marker doesn't hold (an extra, or another platform
+    or Python version) are left out, since installing the distribution
+    doesn't pull them in.
+    """
+    from importlib.metadata import distributions
+
+    graph: dict[str, set[str]] = {}
+    for dist in distributions(**({"path": paths} if paths is not None else {})):
+        name = dist.metadata["Name"]
+        if not name:
+            continue
+        deps = graph.setdefault(normalize_python_name(name), set())
+        for requirement in dist.requires or ():
+            requirement, _, marker = requirement.partition(";")
+            if marker.strip() and not marker_applies(marker):
+                continue
+            match = REQUIREMENT_NAME.match(requirement)
+            if match:
+                deps.add(normalize_python_name(match.group(1)))
+    return graph
+
+
+def npm_lock_graph(lock_path: Path) -> Optional[dict[str, set[str]]]:
+    """Build the dependency graph recorded in a package-lock.json.
+
+    Returns None if there is no readable lockfile.
+    """
+    try:
+        lock = json.loads(lock_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    graph: dict[str, set[str]] = {}
+
+    # Lockfile v2/v3: flat "packages" keyed by node_modules path
+    packages = lock.get("packages")
+    if isinstance(packages, dict):
+        for path, info in packages.items():
+            # "" is the root project itself
+            if not path:
+                continue
+            name = path.rsplit("node_modules/", 1)[-1].lower()
+            deps = graph.setdefault(name, set())
+            for key in ("dependencies", "optionalDependencies"):
+                deps.update(dep.lower() for dep in info.get(key, {}))
+        return graph
+
+    # Lockfile v1: nested "dependencies" with "requires"
+    def walk(dependencies: dict) -> None:
+        for name, info in dependencies.items():
+            deps = graph.setdefault(name.lower(), set())
+            deps.update(dep.lower() for dep in info.get("requires", {}))
+            walk(info.get("dependencies", {}))
+
+    walk(lock.get("dependencies", {}))
+    return graph
+
+
+def brew_dependency_graph(brew_cmd: str) -> Optional[dict[str, set[str]]]:
+    """Build the dependency graph of installed Homebrew formulae.
+
+    Uses `brew deps --installed --direct`, which prints one
+    `formula: dep dep ...` line per installed formula.
+    """
+    try:
+        result = subprocess.run(
+            [brew_cmd, "deps", "--installed", "--direct"],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    graph: dict[str, set[str]] = {}
+    for line in result.stdout.splitlines():
+        name, sep, deps = line.partition(":")
+        if not sep:
+            continue
+        graph[name.strip().rsplit("/", 1)[-1].lower()] = {
+            dep.rsplit("/", 1)[-1].lower() for dep in deps.split()
+        }
+    return graph
@@ -1,5 +1,8 @@
 """Display formatting for deals."""
 
+import io
+from typing import Optional
+
 from rich.console import Console
 from rich.panel import Panel
 
@@ -7,24 +10,41 @@ from rich.panel import Panel
 console = Console()
 
 
-def display_deal(deal: dict) -> None:
-    """Display a deal in a nice format - shows original freetext."""
+def deal_panel(deal: dict) -> Panel:
+    """Build the panel for a deal - shows original freetext."""
     product_name = deal.get("product_name", "Unknown")
-    raw_text = deal.get("raw_text", "")
+    raw_text = deal.get("raw_text")
+    if raw_text is None:
+        # Lookups return metadata only; fetch the body now that we show it
+        from .lookup import load_deal_text
+        raw_text = load_deal_text(deal)
 
     # Create a panel with the raw text
-    panel = Panel(
+    return Panel(
         raw_text,
         title=f"[bold cyan]Found deal for {product_name}![/bold cyan]",
         border_style="green",
         padding=(1, 2),
     )
 
+
+def display_deal(deal: dict) -> None:
+    """Display a deal in a nice format - shows original freetext."""
     console.print()
-    console.print(panel)
+    console.print(deal_panel(deal))
     console.print()
 
 
+def render_deal(deal: dict, width: Optional[int] = None) -> str:
+    """Render a deal to terminal text (with colors) for printing later."""
+    buffer = io.StringIO()
+    render_console = Console(file=buffer, force_terminal=True, width=width)
+    render_console.print()
+    render_console.print(deal_panel(deal))
+    render_console.print()
+    return buffer.getvalue()
+
+
 def prompt_for_payment() -> bool:
     """Prompt user if they want to pay 1 cent as a thank you."""
     console.print("[dim]Pay cli-saver 1¢ as a thank you?[/dim] ", end="")
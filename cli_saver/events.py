@@ -0,0 +1,180 @@
+"""Append-only event log for deal impressions, tips and saves.
+
+Events are appended to one segment file per day under ~/.cli-saver/events
+as length-prefixed binary records, so recording an event is a single
+O_APPEND write with no read-modify-write of shared state:
+
+    <d timestamp> <B kind> <B manager length> <H package length> manager package
+
+`rollup_events()` folds the log into per-package and per-day counts. Segments
+older than a cutoff are compacted into rollup.json and deleted, so the log
+stays small without ever being rewritten on the install path.
+"""
+
+import json
+import os
+import struct
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .config import get_config_dir, state_lock
+
+
+SHOWN = 1
+TIPPED = 2
+DECLINED = 3
+SAVED = 4
+
+EVENT_NAMES = {
+    SHOWN: "shown",
+    TIPPED: "tipped",
+    DECLINED: "declined",
+    SAVED: "saved",
+}
+
+# Rollup counters. "reshown" is derived: a SHOWN event for a package that
+# has already been shown before.
+COUNTERS = ("shown", "reshown", "tipped", "declined", "saved")
+
+RECORD_HEADER = struct.Struct("<dBBH")
+SEGMENT_SUFFIX = ".log"
+
+
+def get_events_dir() -> Path:
+    """Get the directory holding event log segments."""
+    events_dir = get_config_dir() / "events"
+    events_dir.mkdir(exist_ok=True)
+    return events_dir
+
+
+def get_rollup_path() -> Path:
+    """Get the path to the compacted rollup of old segments."""
+    return get_events_dir() / "rollup.json"
+
+
+def encode_event(kind: int, package: str, manager: str = "", timestamp: Optional[float] = None) -> bytes:
+    """Encode one event as a length-prefixed record."""
+    manager_bytes = manager.encode()[:255]
+    package_bytes = package.encode()[:65535]
+    header = RECORD_HEADER.pack(
+        time.time() if timestamp is None else timestamp,
+        kind,
+        len(manager_bytes),
+        len(package_bytes),
+    )
+    return header + manager_bytes + package_bytes
+
+
+def record_event(kind: int, package: str, manager: str = "") -> None:
+    """Append an event to today's segment.
+
+    Never raises: analytics must not break an install.
+    """
+    try:
+        timestamp = time.time()
+        record = encode_event(kind, package, manager, timestamp)
+        segment = get_events_dir() / (date.fromtimestamp(timestamp).isoformat() + SEGMENT_SUFFIX)
+        fd = os.open(segment, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, record)
+        finally:
+            os.close(fd)
+    except Exception:
+        pass
+
+
+def read_segment(path: Path) -> Iterator[tuple[float, int, str, str]]:
+    """Read (timestamp, kind, manager, package) events from a segment.
+
+    A truncated record at the end (e.g. from a crash mid-write) is ignored.
+    """
+    data = path.read_bytes()
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        timestamp, kind, manager_len, package_len = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        end = offset + manager_len + package_len
+        if end > len(data):
+            break
+        manager = data[offset:offset + manager_len].decode(errors="replace")
+        package = data[offset + manager_len:end].decode(errors="replace")
+        offset = end
+        yield timestamp, kind, manager, package
+
+
+def list_segments() -> list[Path]:
+    """List event log segments, oldest first."""
+    return sorted(get_events_dir().glob("*" + SEGMENT_SUFFIX))
+
+
+def empty_rollup() -> dict:
+    """Create an empty rollup."""
+    return {"packages": {}, "days": {}}
+
+
+def load_rollup() -> dict:
+    """Load the compacted rollup of old segments."""
+    rollup_path = get_rollup_path()
+    if rollup_path.exists():
+        return json.loads(rollup_path.read_text())
+    return empty_rollup()
+
+
+def save_rollup(rollup: dict) -> None:
+    """Save the compacted rollup atomically."""
+    rollup_path = get_rollup_path()
+    tmp_path = rollup_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(rollup, indent=2))
+    os.replace(tmp_path, rollup_path)
+
+
+def fold_segment(rollup: dict, path: Path) -> None:
+    """Add the events in a segment to a rollup."""
+    for timestamp, kind, _manager, package in read_segment(path):
+        name = EVENT_NAMES.get(kind)
+        if name is None:
+            continue
+
+        package_counts = rollup["packages"].setdefault(package, dict.fromkeys(COUNTERS, 0))
+        if name == "shown" and package_counts["shown"]:
+            name = "reshown"
+
+        day = date.fromtimestamp(timestamp).isoformat()
+        day_counts = rollup["days"].setdefault(day, dict.fromkeys(COUNTERS, 0))
+
+        package_counts[name] += 1
+        day_counts[name] += 1
+
+
+def compact(keep_days: int = 30) -> int:
+    """Fold segments older than `keep_days` into the rollup and delete them.
+
+    Returns the number of segments compacted. Runs under the state lock so
+    concurrent reports can't fold the same segments twice.
+    """
+    cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+    with state_lock():
+        old_segments = [path for path in list_segments() if path.stem < cutoff]
+        if not old_segments:
+            return 0
+
+        rollup = load_rollup()
+        for path in old_segments:
+            fold_segment(rollup, path)
+        save_rollup(rollup)
+
+        for path in old_segments:
+            path.unlink(missing_ok=True)
+    return len(old_segments)
+
+
+def rollup_events() -> dict:
+    """Roll up the whole log (compacted and live segments)."""
+    # Hold the lock so a concurrent compaction can't move segments mid-read
+    with state_lock():
+        result = load_rollup()
+        for path in list_segments():
+            fold_segment(result, path)
+    return result
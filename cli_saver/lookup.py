@@ -1,12 +1,56 @@
 """Deal lookup functionality."""
 
+import sqlite3
 from typing import Optional
-from cli_saver_deals_agent.database import init_db, find_deal_by_package
+from cli_saver_deals_agent.database import (
+    open_readonly,
+    find_deal_by_package,
+    find_top_deals,
+    get_deal_text,
+)
+
+from .config import get_deal_layers
+
+
+_connection: Optional[sqlite3.Connection] = None
+
+
+def _deals_db() -> sqlite3.Connection:
+    """Get the process-wide read-only deals connection, opening it once.
+
+    An install looks up deals and then loads the bodies it shows; reusing
+    one connection keeps its statement and page caches warm across those.
+    """
+    global _connection
+    if _connection is None:
+        _connection = open_readonly(layers=get_deal_layers())
+    return _connection
 
 
 def lookup_deal(package_name: str) -> Optional[dict]:
     """Look up a deal for a package name."""
-    conn = init_db()
-    deal = find_deal_by_package(conn, package_name)
-    conn.close()
-    return deal
+    return find_deal_by_package(_deals_db(), package_name)
+
+
+def lookup_top_deals(
+    package_names: list[str],
+    k: Optional[int] = 1,
+    active_on: Optional[str] = None,
+) -> dict[str, list[dict]]:
+    """Look up the top-k deals for many package names, best first.
+
+    Returns a dict mapping lowercased package name to its ranked deals.
+    """
+    if not package_names:
+        return {}
+    return find_top_deals(_deals_db(), package_names, k=k, active_on=active_on)
+
+
+def load_deal_text(deal: dict) -> str:
+    """Load the (possibly compressed) body text of a looked-up deal."""
+    if "id" not in deal:
+        return ""
+    try:
+        return get_deal_text(_deals_db(), deal["id"], deal.get("layer", "main"))
+    except KeyError:
+        return ""
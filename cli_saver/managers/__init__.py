@@ -0,0 +1,90 @@
+"""Package manager plugins.
+
+Each supported package manager is a `PackageManager` subclass that knows
+how to spot an install command, pull package specs out of its arguments
+and normalize them into deal lookup keys.
+
+Plugins are loaded lazily: only the module for the manager being invoked
+is imported. Built-in managers are listed in `BUILTIN_MANAGERS`; third
+party packages can add more through the `cli_saver.managers` entry point
+group, e.g. in their pyproject.toml:
+
+    [project.entry-points."cli_saver.managers"]
+    conda = "my_package.conda:CondaManager"
+"""
+
+import importlib
+from typing import Optional
+
+from .base import PackageManager
+
+
+ENTRY_POINT_GROUP = "cli_saver.managers"
+
+# Manager name -> "module:attribute", imported on first use
+BUILTIN_MANAGERS = {
+    "pip": "cli_saver.managers.pip:PipManager",
+    "uv": "cli_saver.managers.uv:UvManager",
+    "pipx": "cli_saver.managers.pipx:PipxManager",
+    "poetry": "cli_saver.managers.poetry:PoetryManager",
+    "npm": "cli_saver.managers.npm:NpmManager",
+    "pnpm": "cli_saver.managers.pnpm:PnpmManager",
+    "yarn": "cli_saver.managers.yarn:YarnManager",
+    "brew": "cli_saver.managers.brew:BrewManager",
+    "cargo": "cli_saver.managers.cargo:CargoManager",
+}
+
+_loaded: dict[str, PackageManager] = {}
+
+
+def _entry_points() -> list:
+    """Get the entry points registered for package manager plugins."""
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    # Python 3.9 returns a dict of group -> entry points
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+
+def get_manager(name: str) -> Optional[PackageManager]:
+    """Get the plugin for a package manager, loading it on first use.
+
+    Returns None if no plugin is registered under that name.
+    """
+    if name in _loaded:
+        return _loaded[name]
+
+    target = BUILTIN_MANAGERS.get(name)
+    if target is not None:
+        module_name, attr = target.split(":")
+        manager_class = getattr(importlib.import_module(module_name), attr)
+    else:
+        # Entry points are only scanned for names we don't ship
+        matches = [ep for ep in _entry_points() if ep.name == name]
+        if not matches:
+            return None
+        manager_class = matches[0].load()
+
+    manager = manager_class()
+    _loaded[name] = manager
+    return manager
+
+
+def available_managers() -> list[str]:
+    """List all package manager names, built-in ones first."""
+    names = list(BUILTIN_MANAGERS)
+    for ep in _entry_points():
+        if ep.name not in names:
+            names.append(ep.name)
+    return names
+
+
+__all__ = [
+    "PackageManager",
+    "BUILTIN_MANAGERS",
+    "ENTRY_POINT_GROUP",
+    "get_manager",
+    "available_managers",
+]
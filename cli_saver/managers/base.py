@@ -0,0 +1,112 @@
+"""Base class for package manager plugins."""
+
+from typing import Optional
+
+
+class PackageManager:
+    """A package manager cli-saver knows how to wrap.
+
+    Subclasses set `name`, the install verbs and the flags that consume a
+    value, and override `parse_spec`/`normalize` where the manager's
+    package spec syntax differs from the defaults.
+    """
+
+    name: str = ""
+    # Each verb is the sequence of positional words that starts an install,
+    # e.g. ("install",) for `pip install` or ("pip", "install") for `uv pip install`
+    install_verbs: tuple[tuple[str, ...], ...] = (("install",),)
+    # Flags whose value is the following argument (e.g. `-r requirements.txt`)
+    value_flags: frozenset[str] = frozenset()
+    # Whether `dependency_graph` can see what an install pulled in
+    scans_dependencies: bool = False
+
+    def _skips_value(self, arg: str) -> bool:
+        """Check whether a flag consumes the next argument."""
+        return arg in self.value_flags
+
+    def find_install(self, args: list[str]) -> Optional[int]:
+        """Find the install verb in the arguments.
+
+        Returns the index of the first argument after the verb, or None if
+        this is not an install command.
+        """
+        words: tuple[str, ...] = ()
+        skip_next = False
+
+        for i, arg in enumerate(args):
+            if skip_next:
+                skip_next = False
+                continue
+            if arg.startswith("-"):
+                skip_next = self._skips_value(arg)
+                continue
+
+            words += (arg,)
+            if words in self.install_verbs:
+                return i + 1
+            if not any(verb[:len(words)] == words for verb in self.install_verbs):
+                return None
+
+        return None
+
+    def is_install(self, args: list[str]) -> bool:
+        """Check whether the arguments are an install command."""
+        return self.find_install(args) is not None
+
+    def parse_spec(self, spec: str) -> Optional[str]:
+        """Get the package name from one package spec, or None to skip it."""
+        return spec
+
+    def normalize(self, name: str) -> str:
+        """Normalize a package name into the key used for deal lookups."""
+        return name.lower()
+
+    def extract_packages(self, args: list[str]) -> list[str]:
+        """Extract normalized package names from an install command."""
+        start = self.find_install(args)
+        if start is None:
+            return []
+
+        packages = []
+        skip_next = False
+
+        for arg in args[start:]:
+            if skip_next:
+                skip_next = False
+                continue
+            # Skip flags and their values
+            if arg.startswith("-"):
+                skip_next = self._skips_value(arg)
+                continue
+
+            pkg_name = self.parse_spec(arg)
+            if pkg_name:
+                packages.append(self.normalize(pkg_name))
+
+        return packages
+
+    def dependency_graph(self, real_cmd: str, args: list[str]) -> Optional[dict[str, set[str]]]:
+        """Get the graph of installed packages and their direct dependencies.
+
+        Keys are normalized names. Returns None if it can't be determined
+        for this manager or command.
+        """
+        return None
+
+    def new_dependencies(
+        self,
+        packages: list[str],
+        before: dict[str, set[str]],
+        after: dict[str, set[str]],
+    ) -> list[str]:
+        """Get the dependencies of `packages` that weren't installed before.
+
+        `before` and `after` are `dependency_graph` snapshots taken around
+        the install. Only names that are actually installed afterwards (have
+        a node in `after`) count; a requirement that was skipped, e.g. for
+        another platform, is an edge to nothing.
+        """
+        from ..deps import dependency_closure
+
+        closure = dependency_closure(packages, after)
+        return sorted((closure & set(after)) - set(before) - set(packages))
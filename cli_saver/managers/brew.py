@@ -0,0 +1,22 @@
+"""Homebrew plugin."""
+
+from typing import Optional
+
+from .base import PackageManager
+
+
+class BrewManager(PackageManager):
+    """Homebrew formulae and casks."""
+
+    name = "brew"
+    install_verbs = (("install",),)
+    scans_dependencies = True
+
+    def normalize(self, name: str) -> str:
+        # Tapped formulae (user/tap/formula) are looked up by formula name
+        return name.rsplit("/", 1)[-1].lower()
+
+    def dependency_graph(self, real_cmd: str, args: list[str]) -> Optional[dict[str, set[str]]]:
+        from ..deps import brew_dependency_graph
+
+        return brew_dependency_graph(real_cmd)
@@ -0,0 +1,26 @@
+"""Cargo plugin."""
+
+from typing import Optional
+
+from .base import PackageManager
+
+
+class CargoManager(PackageManager):
+    """Cargo, covering `cargo install` and `cargo add`."""
+
+    name = "cargo"
+    install_verbs = (("install",), ("add",))
+    value_flags = frozenset({
+        "--version", "--vers",
+        "--git", "--branch", "--tag", "--rev", "--path",
+        "--root", "--registry", "--index",
+        "-F", "--features",
+        "--target", "--target-dir", "--profile",
+        "-j", "--jobs",
+        "-p", "--package",
+        "--rename", "--manifest-path",
+    })
+
+    def parse_spec(self, spec: str) -> Optional[str]:
+        # cargo add serde@1.0 / cargo install ripgrep@14
+        return spec.split("@", 1)[0] or None
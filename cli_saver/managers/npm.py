@@ -0,0 +1,65 @@
+"""npm plugin."""
+
+from pathlib import Path
+from typing import Optional
+
+from .base import PackageManager
+
+
+# Spec prefixes that point at something other than a registry package
+NON_REGISTRY_PREFIXES = (
+    ".", "/", "~",
+    "file:", "git:", "git+", "http:", "https:",
+    "github:", "gitlab:", "bitbucket:", "gist:", "link:", "workspace:",
+)
+
+
+class NpmManager(PackageManager):
+    """npm and other managers that take `name@version` specs."""
+
+    name = "npm"
+    install_verbs = (("install",), ("i",), ("add",))
+    value_flags = frozenset({
+        "--tag",
+        "--registry",
+        "--prefix",
+        "--save-prefix",
+        "-w", "--workspace",
+        "--omit", "--include",
+    })
+    scans_dependencies = True
+
+    def parse_spec(self, spec: str) -> Optional[str]:
+        if spec.startswith(NON_REGISTRY_PREFIXES) or spec.endswith((".tgz", ".tar.gz")):
+            return None
+
+        # Scoped packages keep their leading @: @scope/pkg@1.2.3 -> @scope/pkg
+        if spec.startswith("@"):
+            name = "@" + spec[1:].split("@", 1)[0]
+            # "@scope" alone or "@scope/" isn't a package name
+            return name if name.partition("/")[2] else None
+
+        # Aliases (alias@npm:pkg) install under the alias name
+        name = spec.split("@", 1)[0]
+        # user/repo is GitHub shorthand, not a registry package
+        if "/" in name:
+            return None
+        return name or None
+
+    def dependency_graph(self, real_cmd: str, args: list[str]) -> Optional[dict[str, set[str]]]:
+        from ..deps import npm_lock_graph
+
+        # Global installs don't touch the project lockfile
+        if "-g" in args or "--global" in args:
+            return None
+
+        prefix = "."
+        for i, arg in enumerate(args):
+            if arg == "--prefix" and i + 1 < len(args):
+                prefix = args[i + 1]
+            elif arg.startswith("--prefix="):
+                prefix = arg.split("=", 1)[1]
+
+        graph = npm_lock_graph(Path(prefix) / "package-lock.json")
+        # No lockfile yet means nothing was installed before
+        return {} if graph is None else graph
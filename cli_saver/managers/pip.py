@@ -0,0 +1,77 @@
+"""pip plugin."""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from ..deps import normalize_python_name
+from .base import PackageManager
+
+
+# `pip --version` output: "pip 24.0 from /path/site-packages/pip (python 3.12)"
+PIP_LOCATION = re.compile(r" from (.+?)[/\\]pip \(python")
+
+# Flags that install somewhere other than pip's own site-packages
+REDIRECT_FLAGS = frozenset({"-t", "--target", "--prefix", "--root", "--user"})
+
+# Characters that end the name part of a PEP 508 requirement
+SPEC_SEPARATOR = re.compile(r"[\[<>=!~;@\s]")
+
+
+class PipManager(PackageManager):
+    """pip and other managers that take PEP 508 requirement specs."""
+
+    name = "pip"
+    install_verbs = (("install",),)
+    value_flags = frozenset({
+        "-r", "--requirement",
+        "-e", "--editable",
+        "-t", "--target",
+        "-c", "--constraint",
+        "-i", "--index-url",
+        "--extra-index-url",
+        "-f", "--find-links",
+        "--prefix", "--root", "--src",
+        "--platform", "--python-version", "--implementation", "--abi",
+        "--upgrade-strategy",
+        "--no-binary", "--only-binary",
+        "--log", "--cache-dir", "--proxy", "--cert", "--trusted-host",
+    })
+    scans_dependencies = True
+
+    def parse_spec(self, spec: str) -> Optional[str]:
+        # Skip paths (including .[extras] and ..), archives and URLs
+        if "/" in spec or "\\" in spec or spec.startswith("."):
+            return None
+        if spec.endswith((".txt", ".whl", ".zip", ".tar.gz")):
+            return None
+
+        # Remove version specifiers, extras, markers and direct references
+        return SPEC_SEPARATOR.split(spec, maxsplit=1)[0] or None
+
+    def normalize(self, name: str) -> str:
+        # PEP 503: runs of -, _ and . are equivalent, case-insensitive
+        return normalize_python_name(name)
+
+    def site_packages(self, real_cmd: str) -> Optional[str]:
+        """Find the site-packages directory the given pip installs into."""
+        try:
+            result = subprocess.run([real_cmd, "--version"], capture_output=True, text=True)
+        except OSError:
+            return None
+        match = PIP_LOCATION.search(result.stdout)
+        return match.group(1) if match else None
+
+    def dependency_graph(self, real_cmd: str, args: list[str]) -> Optional[dict[str, set[str]]]:
+        from ..deps import python_dependency_graph
+
+        # Installs redirected elsewhere aren't visible in site-packages
+        for arg in args:
+            if arg in REDIRECT_FLAGS or arg.split("=", 1)[0] in REDIRECT_FLAGS:
+                return None
+
+        site_dir = self.site_packages(real_cmd)
+        if site_dir is None or not Path(site_dir).is_dir():
+            return None
+        return python_dependency_graph([site_dir])
@@ -0,0 +1,20 @@
+"""pipx plugin."""
+
+from .pip import PipManager
+
+
+class PipxManager(PipManager):
+    """pipx, which installs applications from PyPI."""
+
+    name = "pipx"
+    install_verbs = (("install",),)
+    value_flags = frozenset({
+        "--python",
+        "--pip-args",
+        "--index-url", "-i",
+        "--suffix",
+        "--preinstall",
+        "--spec",
+    })
+    # Installs into its own environments, not pip's site-packages
+    scans_dependencies = False
@@ -0,0 +1,16 @@
+"""pnpm plugin."""
+
+from .npm import NpmManager
+
+
+class PnpmManager(NpmManager):
+    """pnpm, covering `pnpm add` and `pnpm install <pkg>`."""
+
+    name = "pnpm"
+    install_verbs = (("add",), ("install",), ("i",))
+    value_flags = NpmManager.value_flags | frozenset({
+        "-F", "--filter",
+        "-C", "--dir",
+    })
+    # Doesn't write package-lock.json
+    scans_dependencies = False
@@ -0,0 +1,33 @@
+"""Poetry plugin."""
+
+import re
+from typing import Optional
+
+from .pip import PipManager
+
+
+# Poetry also accepts `name@^1.0` and `name^1.0` style constraints
+SPEC_SEPARATOR = re.compile(r"[\[<>=!~^@;\s]")
+
+
+class PoetryManager(PipManager):
+    """Poetry, covering `poetry add`."""
+
+    name = "poetry"
+    install_verbs = (("add",),)
+    value_flags = frozenset({
+        "-G", "--group",
+        "-E", "--extras",
+        "--source",
+        "--python",
+        "--platform",
+        "--markers",
+        "-C", "--directory",
+    })
+    # Installs into its own environments, not pip's site-packages
+    scans_dependencies = False
+
+    def parse_spec(self, spec: str) -> Optional[str]:
+        if "/" in spec or "\\" in spec or spec.startswith("."):
+            return None
+        return SPEC_SEPARATOR.split(spec, maxsplit=1)[0] or None
@@ -0,0 +1,20 @@
+"""uv plugin."""
+
+from .pip import PipManager
+
+
+class UvManager(PipManager):
+    """uv, covering `uv pip install`, `uv add` and `uv tool install`."""
+
+    name = "uv"
+    install_verbs = (("pip", "install"), ("add",), ("tool", "install"))
+    value_flags = PipManager.value_flags | frozenset({
+        "-p", "--python",
+        "--index", "--default-index",
+        "--group", "--optional",
+        "--package", "--directory", "--project",
+        "-w", "--with", "--with-editable", "--with-requirements",
+        "--config-file",
+    })
+    # Installs into its own environments, not pip's site-packages
+    scans_dependencies = False
@@ -0,0 +1,15 @@
+"""Yarn plugin."""
+
+from .npm import NpmManager
+
+
+class YarnManager(NpmManager):
+    """Yarn, covering `yarn add` and `yarn global add`."""
+
+    name = "yarn"
+    install_verbs = (("add",), ("global", "add"))
+    value_flags = NpmManager.value_flags | frozenset({
+        "--cwd",
+    })
+    # Doesn't write package-lock.json
+    scans_dependencies = False
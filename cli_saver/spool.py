@@ -0,0 +1,196 @@
+"""Background deal checks and the per-session spool they report to.
+
+In detached mode the wrapper returns as soon as the package manager
+exits and hands the deal check to a background process. Deals it finds
+are written as pre-rendered text files into a spool directory for the
+current shell session; the prompt hook from `cli-saver shell-init` prints
+and removes them before the next prompt without starting Python.
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from .config import get_config_dir
+
+
+SESSION_ENV = "CLI_SAVER_SESSION"
+
+
+def make_session_id(pid: int) -> str:
+    """Build the session ID of a shell on this host.
+
+    PIDs are only unique per host, and ~/.cli-saver may be shared between
+    hosts or containers, so the hostname is part of the ID.
+    """
+    return f"{socket.gethostname()}-{pid}"
+
+
+def get_session_id() -> str:
+    """Get the current shell session ID.
+
+    shell-init exports it as hostname-PID of the shell; without it we fall
+    back to our parent process, which is the shell when invoked via the
+    aliases.
+    """
+    return os.environ.get(SESSION_ENV) or make_session_id(os.getppid())
+
+
+def get_spool_dir(session_id: Optional[str] = None) -> Path:
+    """Get the spool directory for a shell session."""
+    spool_dir = get_config_dir() / "spool" / (session_id or get_session_id())
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    return spool_dir
+
+
+def write_finding(text: str, session_id: Optional[str] = None) -> Path:
+    """Write rendered deal text to the session spool.
+
+    The file is written under a dot-name and renamed into place, so the
+    prompt hook (which only globs *.txt) never sees a partial file.
+    """
+    spool_dir = get_spool_dir(session_id)
+    name = f"{time.time_ns()}-{os.getpid()}"
+    tmp_path = spool_dir / f".{name}.tmp"
+    tmp_path.write_text(text)
+    final_path = spool_dir / f"{name}.txt"
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+def session_alive(session_id: str) -> bool:
+    """Check whether the shell a session ID belongs to is still running.
+
+    Sessions of other hosts, and IDs that aren't hostname-PID, can't be
+    checked from here and count as alive.
+    """
+    host, _, pid = session_id.rpartition("-")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def prune_spool() -> None:
+    """Remove spool directories of this host's shell sessions that have exited.
+
+    Nothing will print their findings any more, and a later shell that
+    reuses the PID shouldn't get them.
+    """
+    spool_root = get_config_dir() / "spool"
+    if not spool_root.is_dir():
+        return
+    current = get_session_id()
+    for session_dir in spool_root.iterdir():
+        if session_dir.is_dir() and session_dir.name != current and not session_alive(session_dir.name):
+            shutil.rmtree(session_dir, ignore_errors=True)
+
+
+def write_snapshot(real_cmd: str, args: list[str], before: dict[str, set[str]]) -> Path:
+    """Save a pre-install dependency graph for the detached check to diff.
+
+    Written as a dot-file, so the prompt hook never picks it up.
+    """
+    path = get_spool_dir() / f".{time.time_ns()}-{os.getpid()}.deps.json"
+    path.write_text(json.dumps({
+        "real_cmd": real_cmd,
+        "args": args,
+        "before": {name: sorted(deps) for name, deps in before.items()},
+    }))
+    return path
+
+
+def new_dependencies_since(package_manager: str, packages: list[str], snapshot_path: Path) -> list[str]:
+    """Re-scan installed packages and get the dependencies new since a snapshot."""
+    from .managers import get_manager
+
+    try:
+        snapshot = json.loads(snapshot_path.read_text())
+    except (OSError, ValueError):
+        return []
+    finally:
+        snapshot_path.unlink(missing_ok=True)
+
+    manager = get_manager(package_manager)
+    if manager is None:
+        return []
+    after = manager.dependency_graph(snapshot["real_cmd"], snapshot["args"])
+    if after is None:
+        return []
+    before = {name: set(deps) for name, deps in snapshot["before"].items()}
+    return manager.new_dependencies(packages, before, after)
+
+
+def spawn_deal_check(
+    package_manager: str,
+    packages: list[str],
+    all_deals: bool = False,
+    snapshot: Optional[Path] = None,
+) -> None:
+    """Run the deal check for installed packages in a detached process.
+
+    With a `snapshot` from `write_snapshot`, the process also scans for
+    dependencies the install pulled in, so that scan doesn't hold up the
+    shell either.
+    """
+    env = dict(os.environ)
+    env[SESSION_ENV] = get_session_id()
+    # Render panels at the width of the terminal the user is looking at
+    env.setdefault("COLUMNS", str(shutil.get_terminal_size().columns))
+
+    flags = ["--all-deals"] if all_deals else []
+    if snapshot is not None:
+        flags += ["--deps", str(snapshot)]
+    subprocess.Popen(
+        [sys.executable, "-m", "cli_saver.spool"] + flags + [package_manager] + packages,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+        env=env,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point for the detached deal check process."""
+    argv = sys.argv[1:] if argv is None else argv
+    all_deals = False
+    snapshot = None
+    while argv and argv[0] in ("--all-deals", "--deps"):
+        if argv[0] == "--all-deals":
+            all_deals = True
+            argv = argv[1:]
+        else:
+            snapshot = Path(argv[1]) if len(argv) > 1 else None
+            argv = argv[2:]
+    if not argv:
+        return 2
+
+    from .wrapper import check_deals
+
+    try:
+        prune_spool()
+        package_manager, packages = argv[0], argv[1:]
+        if snapshot is not None:
+            packages += new_dependencies_since(package_manager, packages, snapshot)
+        check_deals(package_manager, packages, detached=True, all_deals=all_deals)
+    except Exception:
+        # Nobody is watching this process; never leave a traceback around
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@
 import requests
 from rich.console import Console
 from .config import get_proxlock_api_key
+from .events import record_event, SAVED
 
 
 console = Console()
@@ -50,6 +51,11 @@ def save_to_proxlock(deal: dict) -> bool:
 
         if response.status_code in (200, 201):
             console.print("[dim]Code saved to Proxlock[/dim]")
+            record_event(
+                SAVED,
+                deal.get("package_name") or deal.get("product_name") or "unknown",
+                deal.get("package_manager") or "",
+            )
             return True
         else:
             # Silently fail - storage is optional
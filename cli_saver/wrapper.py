@@ -1,14 +1,18 @@
 """Package manager wrapper logic."""
 
-import re
 import subprocess
 import sys
 import shutil
+from datetime import date
 from typing import Optional
 
-from .lookup import lookup_deal
-from .display import display_deal, prompt_for_payment, console
-from .config import is_package_seen, mark_package_seen
+from cli_saver_deals_agent.database import package_key
+
+from .lookup import lookup_top_deals
+from .display import display_deal, render_deal, prompt_for_payment, console
+from .config import mark_package_seen, seen_packages
+from .managers import get_manager
+from .events import record_event, SHOWN, TIPPED, DECLINED
 
 
 def get_real_command(package_manager: str) -> Optional[str]:
@@ -27,86 +31,100 @@ def get_real_command(package_manager: str) -> Optional[str]:
     return shutil.which(package_manager)
 
 
-def extract_packages_from_pip(args: list[str]) -> list[str]:
-    """Extract package names from pip install command."""
-    packages = []
-    skip_next = False
-
-    # Look for 'install' command
-    if "install" not in args:
-        return []
-
-    install_idx = args.index("install")
-
-    for i, arg in enumerate(args[install_idx + 1:], start=install_idx + 1):
-        if skip_next:
-            skip_next = False
-            continue
-
-        # Skip flags and their values
-        if arg.startswith("-"):
-            if arg in ("-r", "--requirement", "-e", "--editable", "-t", "--target", "-c", "--constraint"):
-                skip_next = True
-            continue
-
-        # Skip if it looks like a path
-        if "/" in arg or arg.endswith(".txt") or arg.endswith(".whl"):
-            continue
-
-        # Extract package name (remove version specifiers and extras)
-        pkg_name = re.split(r'[\[<>=!~]', arg)[0]
-        if pkg_name:
-            packages.append(pkg_name.lower())
-
-    return packages
-
-
-def extract_packages_from_brew(args: list[str]) -> list[str]:
-    """Extract package names from brew install command."""
-    packages = []
-
-    if "install" not in args:
-        return []
-
-    install_idx = args.index("install")
-
-    for arg in args[install_idx + 1:]:
-        # Skip flags
-        if arg.startswith("-"):
-            continue
-        packages.append(arg.lower())
-
-    return packages
-
-
-def extract_packages_from_npm(args: list[str]) -> list[str]:
-    """Extract package names from npm install command."""
-    packages = []
+def unseen_packages(package_manager: str, packages: list[str]) -> list[str]:
+    """Drop packages we've already shown deals for, keeping their order."""
+    seen = seen_packages(package_manager)
+    return [package for package in packages if package not in seen]
+
+
+def check_deals(
+    package_manager: str,
+    packages: list[str],
+    detached: bool = False,
+    all_deals: bool = False,
+) -> None:
+    """Look up and show deals for installed packages.
+
+    Only the best-ranked deal per package is shown unless `all_deals` is
+    set. In detached mode there is no terminal to talk to: deals are
+    written to the session spool for the shell prompt hook to print, and
+    the payment prompt is skipped.
+    """
+    # Skip packages we've already shown deals for, then look the rest up at once.
+    # Fetch one extra deal so we can say whether more are available.
+    unseen = unseen_packages(package_manager, packages)
+    top_deals = lookup_top_deals(
+        unseen,
+        k=None if all_deals else 2,
+        active_on=date.today().isoformat(),
+    )
 
-    # npm uses 'install' or 'i'
-    install_idx = None
-    for i, arg in enumerate(args):
-        if arg in ("install", "i", "add"):
-            install_idx = i
-            break
+    for package in unseen:
+        ranked = top_deals.get(package_key(package))
+        if ranked:
+            deal = ranked[0]
+            shown = ranked if all_deals else ranked[:1]
+            more = len(ranked) - len(shown)
+
+            # Mark as seen; if another install claimed it first, it shows it
+            if not mark_package_seen(package_manager, package):
+                continue
+
+            hint = ""
+            if more:
+                hint = f"More deals for {package}: cli-saver deals --manager {package_manager} {package}\n"
+
+            if detached:
+                from .spool import write_finding
+                write_finding("".join(render_deal(d) for d in shown) + hint)
+            else:
+                for d in shown:
+                    display_deal(d)
+                if hint:
+                    console.print(f"[dim]{hint.strip()}[/dim]")
+            record_event(SHOWN, package, package_manager)
 
-    if install_idx is None:
-        return []
+            # Ask about payment
+            tipped = False if detached else prompt_for_payment()
+            if not detached:
+                record_event(TIPPED if tipped else DECLINED, package, package_manager)
+            if tipped:
+                try:
+                    from .payments import process_payment
+                    process_payment()
+                except ImportError:
+                    console.print("[yellow]Payment module not available. Install with: pip install cli-saver[payments][/yellow]")
+                except Exception as e:
+                    console.print(f"[yellow]Payment failed: {e}[/yellow]")
 
-    for arg in args[install_idx + 1:]:
-        # Skip flags
-        if arg.startswith("-"):
-            continue
-        # Remove version specifier
-        pkg_name = arg.split("@")[0]
-        if pkg_name:
-            packages.append(pkg_name.lower())
+            # Try to save to Proxlock
+            try:
+                from .storage import save_to_proxlock
+                save_to_proxlock(deal)
+            except Exception:
+                pass  # Silently ignore storage errors
 
-    return packages
 
+def wrap_command(
+    package_manager: str,
+    args: list[str],
+    dry_run: bool = False,
+    detach: bool = False,
+    deps: bool = False,
+    all_deals: bool = False,
+) -> int:
+    """Wrap a package manager command and check for deals.
+
+    With `detach`, the deal check runs in a background process so the
+    package manager's exit code is returned as soon as it finishes. With
+    `deps`, packages newly pulled in as dependencies are checked too.
+    With `all_deals`, every deal for a package is shown, not just the best.
+    """
+    manager = get_manager(package_manager)
+    if manager is None:
+        console.print(f"[red]Error: Unsupported package manager {package_manager}[/red]")
+        return 1
 
-def wrap_command(package_manager: str, args: list[str], dry_run: bool = False) -> int:
-    """Wrap a package manager command and check for deals."""
     # Get the real command path
     real_cmd = get_real_command(package_manager)
     if not real_cmd:
@@ -114,19 +132,17 @@ def wrap_command(package_manager: str, args: list[str], dry_run: bool = False) -
         return 1
 
     # Extract packages being installed
-    if package_manager == "pip":
-        packages = extract_packages_from_pip(args)
-    elif package_manager == "brew":
-        packages = extract_packages_from_brew(args)
-    elif package_manager == "npm":
-        packages = extract_packages_from_npm(args)
-    else:
-        packages = []
+    packages = manager.extract_packages(args)
 
     if dry_run:
         console.print(f"[dim]Would run: {real_cmd} {' '.join(args)}[/dim]")
         console.print(f"[dim]Packages detected: {packages}[/dim]")
 
+    # Snapshot what's installed so new dependencies can be told apart
+    before = None
+    if deps and packages and not dry_run and manager.scans_dependencies:
+        before = manager.dependency_graph(real_cmd, args)
+
     # Run the actual command
     if not dry_run:
         result = subprocess.run([real_cmd] + args)
@@ -138,34 +154,20 @@ def wrap_command(package_manager: str, args: list[str], dry_run: bool = False) -
     else:
         exit_code = 0
 
-    # Check for deals for each package
-    for package in packages:
-        # Skip if we've already shown this deal
-        if is_package_seen(package_manager, package):
-            continue
-
-        deal = lookup_deal(package)
-        if deal:
-            display_deal(deal)
+    if not packages:
+        return exit_code
 
-            # Mark as seen
-            mark_package_seen(package_manager, package)
+    if detach and not dry_run:
+        # The post-install dependency scan runs in the background too
+        from .spool import spawn_deal_check, write_snapshot
+        snapshot = write_snapshot(real_cmd, args, before) if before is not None else None
+        spawn_deal_check(package_manager, packages, all_deals=all_deals, snapshot=snapshot)
+        return exit_code
 
-            # Ask about payment
-            if prompt_for_payment():
-                try:
-                    from .payments import process_payment
-                    process_payment()
-                except ImportError:
-                    console.print("[yellow]Payment module not available. Install with: pip install cli-saver[payments][/yellow]")
-                except Exception as e:
-                    console.print(f"[yellow]Payment failed: {e}[/yellow]")
-
-            # Try to save to Proxlock
-            try:
-                from .storage import save_to_proxlock
-                save_to_proxlock(deal)
-            except Exception:
-                pass  # Silently ignore storage errors
+    if before is not None:
+        after = manager.dependency_graph(real_cmd, args)
+        if after is not None:
+            packages += manager.new_dependencies(packages, before, after)
 
+    check_deals(package_manager, packages, all_deals=all_deals)
     return exit_code
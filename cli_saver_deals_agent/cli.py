@@ -1,12 +1,14 @@
 """CLI for the deals agent."""
 
 import click
+from datetime import date
 from pathlib import Path
 from rich.console import Console
-from rich.table import Table
+from rich.markup import escape
 
 from .parser import parse_seed_file
-from .database import init_db, clear_deals, insert_deal, get_all_deals
+from .compression import train_dictionary
+from .database import init_db, open_readonly, clear_deals, insert_deal, iter_deals, store_dictionary
 
 
 console = Console()
@@ -21,7 +23,8 @@ def main():
 @main.command()
 @click.argument("seed_file", type=click.Path(exists=True))
 @click.option("--clear", is_flag=True, help="Clear existing deals before parsing")
-def parse(seed_file: str, clear: bool):
+@click.option("--compress", is_flag=True, help="Store deal text compressed with a dictionary trained on this file")
+def parse(seed_file: str, clear: bool, compress: bool):
     """Parse a seed file and add deals to the database."""
     seed_path = Path(seed_file)
     content = seed_path.read_text()
@@ -34,6 +37,13 @@ def parse(seed_file: str, clear: bool):
         clear_deals(conn)
         console.print("[yellow]Cleared existing deals[/yellow]")
 
+    dict_id = None
+    zdict = None
+    if compress:
+        zdict = train_dictionary([deal.raw_text for deal in deals])
+        if zdict:
+            dict_id = store_dictionary(conn, zdict)
+
     added = 0
     for deal in deals:
         insert_deal(
@@ -42,6 +52,13 @@ def parse(seed_file: str, clear: bool):
             raw_text=deal.raw_text,
             package_name=deal.package_name,
             package_manager=deal.package_manager,
+            code=deal.code,
+            value=deal.value,
+            url=deal.url,
+            expires_at=deal.expires_at,
+            compress=compress,
+            dict_id=dict_id,
+            zdict=zdict,
         )
         added += 1
         console.print(f"[green]Added:[/green] {deal.product_name}", end="")
@@ -54,33 +71,105 @@ def parse(seed_file: str, clear: bool):
 
 
 @main.command()
-def list():
-    """List all deals in the database."""
+@click.option("--limit", type=click.IntRange(min=0), default=None, help="Show at most this many deals")
+@click.option("--offset", type=click.IntRange(min=0), default=0, help="Skip this many deals first")
+@click.option("--after", type=int, default=None, help="Show deals after this deal ID (keyset pagination)")
+@click.option("--manager", default=None, help="Only show deals for this package manager")
+@click.option("--package", default=None, help="Only show deals for this package")
+@click.option("--product", default=None, help="Only show deals for this product")
+@click.option("--min-value", type=float, default=None, help="Only show deals worth at least this many dollars")
+@click.option("--active", is_flag=True, help="Hide expired deals")
+@click.option("--compact", is_flag=True, help="One line per deal instead of full panels")
+def list(
+    limit: int,
+    offset: int,
+    after: int,
+    manager: str,
+    package: str,
+    product: str,
+    min_value: float,
+    active: bool,
+    compact: bool,
+):
+    """List deals in the database."""
     from rich.panel import Panel
 
-    conn = init_db()
-    deals = get_all_deals(conn)
-    conn.close()
-
-    if not deals:
-        console.print("[yellow]No deals in database. Run 'cli-saver-deals parse <seed_file>' first.[/yellow]")
+    conn = open_readonly()
+    deals = iter_deals(
+        conn,
+        limit=limit,
+        offset=offset,
+        after=after,
+        package_manager=manager,
+        package_name=package,
+        product_name=product,
+        min_value=min_value,
+        active_on=date.today().isoformat() if active else None,
+        # Compact rows never show the body, so don't read or inflate it
+        with_text=not compact,
+    )
+
+    shown = 0
+    try:
+        for deal in deals:
+            if shown == 0:
+                console.print()
+                if compact:
+                    console.print(
+                        f"[bold]{'ID':>6}  {'PRODUCT':<20} {'PACKAGE':<20} {'MANAGER':<8} {'VALUE':>7}  CODE / URL[/bold]",
+                        highlight=False,
+                    )
+            shown += 1
+
+            if compact:
+                summary = deal["code"] or deal["url"] or ""
+                value = f"${deal['value']:,.0f}" if deal["value"] is not None else "-"
+                # Pad before escaping so markup escapes don't shift the columns
+                product = f"{deal['product_name'][:20]:<20}"
+                package_name = f"{(deal['package_name'] or '-')[:20]:<20}"
+                package_manager = f"{(deal['package_manager'] or '-')[:8]:<8}"
+                console.print(
+                    f"{deal['id']:>6}  [cyan]{escape(product)}[/cyan] "
+                    f"{escape(package_name)} "
+                    f"{escape(package_manager)} "
+                    f"{value:>7}  "
+                    f"[dim]{escape(summary)}[/dim]",
+                    no_wrap=True,
+                    overflow="ellipsis",
+                    highlight=False,
+                )
+                continue
+
+            title = f"[bold cyan]{escape(deal['product_name'])}[/bold cyan]"
+            if deal["package_name"]:
+                title += f" [dim]({escape(deal['package_name'])})[/dim]"
+            title += f" [dim]#{deal['id']}[/dim]"
+
+            panel = Panel(
+                deal["raw_text"],
+                title=title,
+                border_style="green",
+                padding=(1, 2),
+            )
+            console.print(panel)
+            console.print()
+    finally:
+        deals.close()
+        conn.close()
+
+    if shown == 0:
+        filtered = manager or package or product or min_value is not None or active
+        if filtered or limit is not None or after is not None or offset:
+            console.print("[yellow]No matching deals.[/yellow]")
+        else:
+            console.print("[yellow]No deals in database. Run 'cli-saver-deals parse <seed_file>' first.[/yellow]")
         return
 
-    console.print(f"\n[bold green]{len(deals)} deals in database[/bold green]\n")
-
-    for deal in deals:
-        title = f"[bold cyan]{deal['product_name']}[/bold cyan]"
-        if deal["package_name"]:
-            title += f" [dim]({deal['package_name']})[/dim]"
-
-        panel = Panel(
-            deal["raw_text"],
-            title=title,
-            border_style="green",
-            padding=(1, 2),
-        )
-        console.print(panel)
+    if compact:
         console.print()
+    console.print(f"[bold green]Listed {shown} deal{'' if shown == 1 else 's'}[/bold green]")
+    if limit is not None and shown == limit:
+        console.print(f"[dim]Next page: --after {deal['id']}[/dim]")
 
 
 @main.command()
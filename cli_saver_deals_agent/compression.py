@@ -0,0 +1,74 @@
+"""Compression of deal bodies with a shared preset dictionary.
+
+Deal texts are short and repetitive ("Access code:", "$100 in credits",
+docs.google.com links...), so on their own they barely compress. zlib's
+preset dictionary (`zdict`) lets every body reference substrings that are
+common across the corpus. The stdlib has no dictionary trainer, so
+`train_dictionary` builds one from the most frequent lines and words.
+"""
+
+import zlib
+from collections import Counter
+from typing import Optional
+
+
+# zlib can only reference the last 32 KiB of a preset dictionary
+MAX_DICTIONARY_SIZE = 32 * 1024
+DEFAULT_DICTIONARY_SIZE = 16 * 1024
+
+# Raw deflate: no zlib header or checksum, which matter on short bodies
+WBITS = -15
+
+
+def train_dictionary(texts: list[str], size: int = DEFAULT_DICTIONARY_SIZE) -> bytes:
+    """Build a preset dictionary from substrings shared across texts.
+
+    Candidates are whole lines and words that occur in at least two texts,
+    ranked by how many bytes they would save. The most valuable go last,
+    since deflate encodes nearby matches more cheaply.
+    """
+    size = min(size, MAX_DICTIONARY_SIZE)
+    document_counts: Counter = Counter()
+
+    for text in texts:
+        fragments = set()
+        for line in text.splitlines():
+            line = line.strip()
+            if len(line) >= 4:
+                fragments.add(line + "\n")
+            fragments.update(word + " " for word in line.split() if len(word) >= 4)
+        document_counts.update(fragments)
+
+    ranked = sorted(
+        (fragment for fragment, count in document_counts.items() if count >= 2),
+        key=lambda fragment: document_counts[fragment] * len(fragment),
+    )
+
+    chosen: list[bytes] = []
+    total = 0
+    for fragment in reversed(ranked):
+        encoded = fragment.encode()
+        if total + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+
+    return b"".join(reversed(chosen))
+
+
+def compress_text(text: str, zdict: Optional[bytes] = None) -> bytes:
+    """Compress a deal body, optionally against a preset dictionary."""
+    if zdict:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, WBITS, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, WBITS)
+    return compressor.compress(text.encode()) + compressor.flush()
+
+
+def decompress_text(data: bytes, zdict: Optional[bytes] = None) -> str:
+    """Decompress a deal body compressed with `compress_text`."""
+    if zdict:
+        decompressor = zlib.decompressobj(WBITS, zdict=zdict)
+    else:
+        decompressor = zlib.decompressobj(WBITS)
+    return (decompressor.decompress(data) + decompressor.flush()).decode()
@@ -1,8 +1,76 @@
 """Database operations for deals storage."""
 
+import math
 import sqlite3
+import time
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+from .compression import compress_text, decompress_text
+from .parser import extract_code, extract_expiry, extract_url, extract_value
+
+
+# Stay well under SQLite's bound-parameter limit (999 on older builds)
+LOOKUP_CHUNK_SIZE = 500
+
+# Structured fields extracted at ingest time (see parser.create_deal).
+# Added with ALTER TABLE so databases created before they existed keep working.
+DEAL_FIELD_COLUMNS = {
+    "code": "TEXT",
+    "value": "REAL",
+    "url": "TEXT",
+    "expires_at": "TEXT",
+}
+
+# Optional compressed body: when set, raw_text is left empty and the text
+# is raw_text_z inflated with the preset dictionary dict_id (if any)
+BODY_COLUMNS = {
+    "raw_text_z": "BLOB",
+    "dict_id": "INTEGER",
+}
+
+# Ranking: several deals can map to one package. Each gets a score at
+# ingest time and (package_key, score DESC) is indexed, so the top-k deals
+# for a package come straight off the index without sorting.
+RANKING_COLUMNS = {
+    "package_key": "TEXT",
+    "score": "REAL",
+    "created_at": "REAL",
+}
+
+# Score = log10(1 + dollar value) + a recency bonus per 30 days since
+# SCORE_EPOCH, minus penalties for deals expired or expiring at ingest
+SCORE_EPOCH = 1704067200.0  # 2024-01-01T00:00:00Z
+RECENCY_WEIGHT_PER_MONTH = 0.25
+EXPIRING_SOON_DAYS = 7
+EXPIRING_SOON_PENALTY = 1.0
+EXPIRED_PENALTY = 100.0
+
+# Team layers are extra deal databases attached read-only (ATTACH with
+# mode=ro&immutable=1, so SQLite skips locking on shared/NFS paths).
+# Lookups query the user DB ("main") and then each layer off its own index;
+# for the same package, the user DB's deals come first, then the layers'
+# in the order given.
+LAYER_COLUMNS = frozenset({
+    "id", "product_name", "package_name", "package_manager", "raw_text",
+    "code", "value", "url", "expires_at", "raw_text_z", "dict_id",
+    "package_key", "score",
+})
+
+# Read-only connections are reused for every lookup in a process, so keep
+# plenty of prepared statements around; the deals table is small enough
+# to cache and memory-map whole
+READ_STATEMENT_CACHE = 256
+READ_CACHE_KIB = 8 * 1024
+READ_MMAP_BYTES = 64 * 1024 * 1024
+
+# Everything but the deal body. Lookups and listings select only these and
+# the body is fetched (and decompressed) when it's actually rendered.
+METADATA_COLUMNS = (
+    "id, product_name, package_name, package_manager, code, value, url, expires_at, score"
+)
 
 
 def get_db_path() -> Path:
@@ -12,14 +80,12 @@ def get_db_path() -> Path:
     return db_dir / "deals.db"
 
 
-def init_db(db_path: Optional[Path] = None) -> sqlite3.Connection:
-    """Initialize the database and create tables if needed."""
-    if db_path is None:
-        db_path = get_db_path()
-
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+def _migrate_baseline(conn: sqlite3.Connection) -> None:
+    """Version 1: the schema as of when versioning was introduced.
 
+    Databases from before then are at user_version 0 in any of the earlier
+    shapes, so this only creates what's missing and backfills ranking.
+    """
     # Document-based schema: store original freetext
     conn.execute("""
         CREATE TABLE IF NOT EXISTS deals (
@@ -27,58 +93,580 @@ def init_db(db_path: Optional[Path] = None) -> sqlite3.Connection:
             product_name TEXT NOT NULL,
             package_name TEXT,
             package_manager TEXT,
-            raw_text TEXT NOT NULL
+            raw_text TEXT NOT NULL,
+            code TEXT,
+            value REAL,
+            url TEXT,
+            expires_at TEXT,
+            raw_text_z BLOB,
+            dict_id INTEGER,
+            package_key TEXT,
+            score REAL,
+            created_at REAL
         )
     """)
 
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS deal_dictionaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data BLOB NOT NULL
+        )
+    """)
+
+    existing = {row["name"] for row in conn.execute("PRAGMA table_info(deals)")}
+    for column, column_type in {**DEAL_FIELD_COLUMNS, **BODY_COLUMNS, **RANKING_COLUMNS}.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE deals ADD COLUMN {column} {column_type}")
+
+    # Scores depend on value and expiry, so fill those in before ranking
+    fields_added = not set(DEAL_FIELD_COLUMNS) <= existing
+    if fields_added:
+        backfill_deal_fields(conn)
+    if fields_added or "package_key" not in existing:
+        backfill_ranking(conn)
+
     conn.execute("""
         CREATE INDEX IF NOT EXISTS idx_package_name
         ON deals(package_name)
     """)
 
+    # Package lookups go through idx_package_key_score instead
+    conn.execute("DROP INDEX IF EXISTS idx_package_name_nocase")
+
+    # Case-insensitive indexes back the `list` filters
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_package_manager
+        ON deals(package_manager COLLATE NOCASE)
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_product_name
+        ON deals(product_name)
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_product_name_nocase
+        ON deals(product_name COLLATE NOCASE)
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_package_key_score
+        ON deals(package_key, score DESC)
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_value
+        ON deals(value)
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_expires_at
+        ON deals(expires_at)
+    """)
+
+
+def _migrate_manager_package_keys(conn: sqlite3.Connection) -> None:
+    """Version 2: key deals by their manager's normalized name.
+
+    Keys used to be the lowercased name only, so a deal stored as
+    python_dotenv was missed when pip looked up python-dotenv.
+    """
+    rows = conn.execute("SELECT id, package_name, package_manager FROM deals").fetchall()
+    conn.executemany(
+        "UPDATE deals SET package_key = ? WHERE id = ?",
+        [(package_key(row["package_name"], row["package_manager"]), row["id"]) for row in rows],
+    )
+
+
+# MIGRATIONS[n] upgrades a database at user_version n to n + 1. Append new
+# steps here; never change one that has shipped.
+MIGRATIONS = [
+    _migrate_baseline,
+    _migrate_manager_package_keys,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Bring a database up to SCHEMA_VERSION. Returns its previous version.
+
+    All pending steps and the version bump commit in one transaction; the
+    write lock is taken up front so concurrent writers migrate only once.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == SCHEMA_VERSION:
+        return version
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise sqlite3.DatabaseError(
+                f"Deals database is at schema version {version}, newer than this "
+                f"version of cli-saver supports ({SCHEMA_VERSION})"
+            )
+        for target, migration in enumerate(MIGRATIONS[version:], version + 1):
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+    except BaseException:
+        conn.rollback()
+        raise
     conn.commit()
+    return version
+
+
+def init_db(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Open the database for writing, migrating it first if needed.
+
+    Only write commands should use this; lookups go through
+    `open_readonly`, which never runs DDL on an up-to-date database.
+    """
+    if db_path is None:
+        db_path = get_db_path()
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        migrate(conn)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def _connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """Connect to a database through a mode=ro URI with read tuning applied."""
+    conn = sqlite3.connect(
+        f"{db_path.resolve().as_uri()}?mode=ro",
+        uri=True,
+        cached_statements=READ_STATEMENT_CACHE,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA cache_size = -{READ_CACHE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {READ_MMAP_BYTES}")
+    return conn
+
+
+def open_readonly(
+    db_path: Optional[Path] = None,
+    layers: Optional[list[Path]] = None,
+) -> sqlite3.Connection:
+    """Open the database for lookups without taking a write lock.
+
+    A database that doesn't exist yet or predates SCHEMA_VERSION is
+    migrated once through `init_db` first. `layers` are extra read-only
+    deal databases (e.g. a team DB on a shared path) to attach; lookups on
+    the connection see their deals too.
+    """
+    db_path = Path(db_path) if db_path is not None else get_db_path()
+
+    conn = _connect_readonly(db_path) if db_path.exists() else None
+    if conn is None or conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        if conn is not None:
+            conn.close()
+        init_db(db_path).close()
+        conn = _connect_readonly(db_path)
+
+    if layers:
+        attach_layers(conn, layers)
     return conn
 
 
+def attach_layers(conn: sqlite3.Connection, layers: list[Path]) -> list[str]:
+    """Attach read-only deal databases as layer1, layer2, ...
+
+    Layers that are missing, unreadable or lack the current deals schema
+    are skipped. Returns the schema names that were attached.
+    """
+    attached = []
+    for layer in layers:
+        path = Path(layer).expanduser()
+        if not path.is_file():
+            continue
+
+        schema = f"layer{len(_deal_schemas(conn))}"
+        uri = f"{path.resolve().as_uri()}?mode=ro&immutable=1"
+        try:
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (uri,))
+        except sqlite3.Error:
+            continue  # e.g. unreadable or too many attached databases
+
+        try:
+            columns = {row["name"] for row in conn.execute(f"PRAGMA {schema}.table_info(deals)")}
+        except sqlite3.Error:
+            columns = set()
+        if not LAYER_COLUMNS <= columns:
+            conn.execute(f"DETACH DATABASE {schema}")
+            continue
+        attached.append(schema)
+
+    return attached
+
+
+def _deal_schemas(conn: sqlite3.Connection) -> list[str]:
+    """Get the schemas to read deals from: main first, then attached layers."""
+    return [row["name"] for row in conn.execute("PRAGMA database_list") if row["name"] != "temp"]
+
+
+@lru_cache(maxsize=None)
+def _package_manager(name: str):
+    """Get the cli-saver plugin for a package manager, or None if unknown."""
+    from cli_saver.managers import get_manager
+
+    return get_manager(name)
+
+
+def package_key(package_name: Optional[str], package_manager: Optional[str] = None) -> Optional[str]:
+    """Normalize a package name into the ranking index key.
+
+    With `package_manager`, the name is normalized by that manager's plugin
+    (e.g. PEP 503 for pip), the same way the wrapper normalizes install
+    arguments, so stored keys match the names it looks up.
+    """
+    if not package_name:
+        return None
+    # Remove extras like [tools]
+    name = package_name.split("[")[0].strip()
+    if not name:
+        return None
+    manager = _package_manager(package_manager) if package_manager else None
+    return manager.normalize(name) if manager else name.lower()
+
+
+def deal_score(value: Optional[float], expires_at: Optional[str], created_at: float) -> float:
+    """Score a deal for ranking against other deals for the same package."""
+    score = math.log10(1 + value) if value and value > 0 else 0.0
+    score += (created_at - SCORE_EPOCH) / (30 * 86400) * RECENCY_WEIGHT_PER_MONTH
+
+    if expires_at:
+        try:
+            days_left = (date.fromisoformat(expires_at) - date.fromtimestamp(created_at)).days
+        except ValueError:
+            days_left = None
+        if days_left is not None and days_left < 0:
+            score -= EXPIRED_PENALTY
+        elif days_left is not None and days_left < EXPIRING_SOON_DAYS:
+            score -= EXPIRING_SOON_PENALTY
+
+    return score
+
+
+def backfill_deal_fields(conn: sqlite3.Connection) -> None:
+    """Extract code, value, url and expiry for rows stored before they existed."""
+    dictionaries: dict[tuple[str, int], bytes] = {}
+    rows = conn.execute("SELECT id, raw_text, raw_text_z, dict_id FROM deals").fetchall()
+    updates = []
+    for row in rows:
+        text = _deal_text(conn, row, dictionaries)
+        updates.append((
+            extract_code(text),
+            extract_value(text),
+            extract_url(text),
+            extract_expiry(text),
+            row["id"],
+        ))
+    conn.executemany(
+        "UPDATE deals SET code = ?, value = ?, url = ?, expires_at = ? WHERE id = ?",
+        updates,
+    )
+
+
+def backfill_ranking(conn: sqlite3.Connection) -> None:
+    """Fill in package_key and score for rows inserted before ranking existed."""
+    now = time.time()
+    rows = conn.execute("SELECT id, package_name, package_manager, value, expires_at FROM deals").fetchall()
+    conn.executemany(
+        "UPDATE deals SET package_key = ?, score = ?, created_at = ? WHERE id = ?",
+        [
+            (
+                package_key(row["package_name"], row["package_manager"]),
+                deal_score(row["value"], row["expires_at"], now),
+                now,
+                row["id"],
+            )
+            for row in rows
+        ],
+    )
+
+
 def clear_deals(conn: sqlite3.Connection) -> None:
     """Clear all deals from the database."""
     conn.execute("DELETE FROM deals")
+    conn.execute("DELETE FROM deal_dictionaries")
     conn.commit()
 
 
+def store_dictionary(conn: sqlite3.Connection, data: bytes) -> int:
+    """Store a compression dictionary. Returns its ID."""
+    cursor = conn.execute("INSERT INTO deal_dictionaries (data) VALUES (?)", (data,))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def load_dictionary(conn: sqlite3.Connection, dict_id: int, layer: str = "main") -> bytes:
+    """Load a compression dictionary by ID."""
+    if layer not in _deal_schemas(conn):
+        raise ValueError(f"Unknown deal layer {layer}")
+    row = conn.execute(f"SELECT data FROM {layer}.deal_dictionaries WHERE id = ?", (dict_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"Missing compression dictionary {dict_id}")
+    return row["data"]
+
+
 def insert_deal(
     conn: sqlite3.Connection,
     product_name: str,
     raw_text: str,
     package_name: Optional[str] = None,
     package_manager: Optional[str] = None,
+    code: Optional[str] = None,
+    value: Optional[float] = None,
+    url: Optional[str] = None,
+    expires_at: Optional[str] = None,
+    compress: bool = False,
+    dict_id: Optional[int] = None,
+    zdict: Optional[bytes] = None,
 ) -> int:
-    """Insert a deal into the database. Returns the row ID."""
+    """Insert a deal into the database. Returns the row ID.
+
+    With `compress`, the body is stored zlib-compressed (against the
+    dictionary `dict_id`, whose bytes can be passed as `zdict` to save a
+    lookup) unless that wouldn't make it smaller.
+    """
+    raw_text_z = None
+    if compress:
+        if dict_id is not None and zdict is None:
+            zdict = load_dictionary(conn, dict_id)
+        compressed = compress_text(raw_text, zdict)
+        if len(compressed) < len(raw_text.encode()):
+            raw_text, raw_text_z = "", compressed
+        else:
+            dict_id = None
+    if raw_text_z is None:
+        dict_id = None
+
+    created_at = time.time()
     cursor = conn.execute(
         """
-        INSERT INTO deals (product_name, package_name, package_manager, raw_text)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO deals (
+            product_name, package_name, package_manager, raw_text,
+            code, value, url, expires_at, raw_text_z, dict_id,
+            package_key, score, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        (product_name, package_name, package_manager, raw_text),
+        (
+            product_name, package_name, package_manager, raw_text,
+            code, value, url, expires_at, raw_text_z, dict_id,
+            package_key(package_name, package_manager), deal_score(value, expires_at, created_at), created_at,
+        ),
     )
     conn.commit()
     return cursor.lastrowid
 
 
-def find_deal_by_package(conn: sqlite3.Connection, package_name: str) -> Optional[dict]:
-    """Find a deal by package name. Returns None if not found."""
-    # Normalize package name (remove extras like [tools])
-    base_name = package_name.split("[")[0].strip().lower()
+def _deal_text(
+    conn: sqlite3.Connection,
+    row: sqlite3.Row,
+    dictionaries: dict[tuple[str, int], bytes],
+    layer: str = "main",
+) -> str:
+    """Get the body of a row that has raw_text, raw_text_z and dict_id."""
+    if row["raw_text_z"] is None:
+        return row["raw_text"]
+
+    zdict = None
+    if row["dict_id"] is not None:
+        key = (layer, row["dict_id"])
+        if key not in dictionaries:
+            dictionaries[key] = load_dictionary(conn, row["dict_id"], layer)
+        zdict = dictionaries[key]
+    return decompress_text(row["raw_text_z"], zdict)
 
-    cursor = conn.execute(
-        "SELECT * FROM deals WHERE LOWER(package_name) = ?",
-        (base_name,),
-    )
-    row = cursor.fetchone()
-    return dict(row) if row else None
+
+def _deal_from_row(
+    conn: sqlite3.Connection,
+    row: sqlite3.Row,
+    with_text: bool,
+    dictionaries: dict[tuple[str, int], bytes],
+) -> dict:
+    """Turn a row into a deal dict, decompressing the body if selected."""
+    deal = dict(row)
+    if with_text:
+        deal["raw_text"] = _deal_text(conn, row, dictionaries, deal.get("layer", "main"))
+        del deal["raw_text_z"], deal["dict_id"]
+    return deal
+
+
+def _columns(with_text: bool) -> str:
+    """Get the column list to select for deals."""
+    if with_text:
+        return METADATA_COLUMNS + ", raw_text, raw_text_z, dict_id"
+    return METADATA_COLUMNS
+
+
+def get_deal_text(conn: sqlite3.Connection, deal_id: int, layer: str = "main") -> str:
+    """Get a deal's body text, decompressing it if needed.
+
+    `layer` is the schema the deal came from (the `layer` key of deals
+    returned by lookups).
+    """
+    if layer not in _deal_schemas(conn):
+        raise KeyError(deal_id)
+    row = conn.execute(
+        f"SELECT raw_text, raw_text_z, dict_id FROM {layer}.deals WHERE id = ?",
+        (deal_id,),
+    ).fetchone()
+    if row is None:
+        raise KeyError(deal_id)
+    return _deal_text(conn, row, {}, layer)
+
+
+def find_deal_by_package(
+    conn: sqlite3.Connection,
+    package_name: str,
+    with_text: bool = False,
+) -> Optional[dict]:
+    """Find the best-scored deal for a package. Returns None if not found.
+
+    Only metadata is selected unless `with_text` is set; use
+    `get_deal_text` to fetch the body later.
+    """
+    # Each layer is its own indexed query; the first layer with a deal wins
+    for schema in _deal_schemas(conn):
+        row = conn.execute(
+            f"SELECT '{schema}' AS layer, {_columns(with_text)} FROM {schema}.deals"
+            " WHERE package_key = ? ORDER BY score DESC LIMIT 1",
+            (package_key(package_name),),
+        ).fetchone()
+        if row:
+            return _deal_from_row(conn, row, with_text, {})
+    return None
+
+
+def find_top_deals(
+    conn: sqlite3.Connection,
+    package_names: list[str],
+    k: Optional[int] = 1,
+    with_text: bool = False,
+    active_on: Optional[str] = None,
+) -> dict[str, list[dict]]:
+    """Find the top-k deals for many packages at once, best first.
+
+    Returns a dict mapping each normalized package name that has deals to
+    up to `k` of them (all of them if `k` is None). Rows come off the
+    (package_key, score DESC) index already in order, in chunks, so a whole
+    dependency closure costs a handful of queries and no sorting. With team
+    layers attached, each layer is queried the same way and its deals go
+    after the user DB's (and earlier layers') for the same package.
+    `active_on` is an ISO date; deals that expired before it are skipped.
+    """
+    keys = sorted({key for key in map(package_key, package_names) if key})
+    deals: dict[str, list[dict]] = {}
+    dictionaries: dict[tuple[str, int], bytes] = {}
+
+    expiry_clause = ""
+    expiry_params: list = []
+    if active_on is not None:
+        expiry_clause = " AND (expires_at IS NULL OR expires_at >= ?)"
+        expiry_params.append(active_on)
+
+    schemas = _deal_schemas(conn)
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        for schema in schemas:
+            cursor = conn.execute(
+                f"SELECT package_key, '{schema}' AS layer, {_columns(with_text)} FROM {schema}.deals"
+                f" WHERE package_key IN ({placeholders}){expiry_clause}"
+                " ORDER BY package_key, score DESC",
+                chunk + expiry_params,
+            )
+            for row in cursor:
+                ranked = deals.setdefault(row["package_key"], [])
+                if k is None or len(ranked) < k:
+                    deal = _deal_from_row(conn, row, with_text, dictionaries)
+                    del deal["package_key"]
+                    ranked.append(deal)
+
+    return deals
+
+
+def find_deals_by_packages(
+    conn: sqlite3.Connection,
+    package_names: list[str],
+    with_text: bool = False,
+) -> dict[str, dict]:
+    """Find the best deal for each of many packages at once.
+
+    Returns a dict mapping each normalized package name that has a deal to
+    its best-scored deal.
+    """
+    top_deals = find_top_deals(conn, package_names, k=1, with_text=with_text)
+    return {key: ranked[0] for key, ranked in top_deals.items()}
+
+
+def iter_deals(
+    conn: sqlite3.Connection,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after: Optional[int] = None,
+    package_manager: Optional[str] = None,
+    package_name: Optional[str] = None,
+    product_name: Optional[str] = None,
+    min_value: Optional[float] = None,
+    active_on: Optional[str] = None,
+    with_text: bool = False,
+) -> Iterator[dict]:
+    """Yield deals ordered by product name, one row at a time.
+
+    Rows are streamed from the cursor instead of being fetched up front.
+    `after` is a deal ID for keyset pagination: only deals sorting after
+    that deal are returned, which stays fast however deep the page is.
+    `active_on` is an ISO date; deals that expired before it are skipped.
+    Bodies are only selected and decompressed with `with_text`.
+    """
+    clauses = []
+    params: list = []
+
+    if package_manager:
+        clauses.append("package_manager = ? COLLATE NOCASE")
+        params.append(package_manager)
+    if package_name:
+        clauses.append("package_key = ?")
+        params.append(package_key(package_name, package_manager))
+    if product_name:
+        clauses.append("product_name = ? COLLATE NOCASE")
+        params.append(product_name)
+    if min_value is not None:
+        clauses.append("value >= ?")
+        params.append(min_value)
+    if active_on is not None:
+        clauses.append("(expires_at IS NULL OR expires_at >= ?)")
+        params.append(active_on)
+    if after is not None:
+        clauses.append(
+            "(product_name, id) > (SELECT product_name, id FROM deals WHERE id = ?)"
+        )
+        params.append(after)
+
+    query = f"SELECT {_columns(with_text)} FROM deals"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY product_name, id"
+    if limit is not None or offset:
+        query += " LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+
+    dictionaries: dict[tuple[str, int], bytes] = {}
+    cursor = conn.execute(query, params)
+    try:
+        for row in cursor:
+            yield _deal_from_row(conn, row, with_text, dictionaries)
+    finally:
+        cursor.close()
 
 
-def get_all_deals(conn: sqlite3.Connection) -> list[dict]:
+def get_all_deals(conn: sqlite3.Connection, with_text: bool = False) -> list[dict]:
     """Get all deals from the database."""
-    cursor = conn.execute("SELECT * FROM deals ORDER BY product_name")
-    return [dict(row) for row in cursor.fetchall()]
+    return list(iter_deals(conn, with_text=with_text))
@@ -2,6 +2,7 @@
 
 import re
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 
 
@@ -12,6 +13,10 @@ class Deal:
     raw_text: str
     package_name: Optional[str] = None
     package_manager: Optional[str] = None
+    code: Optional[str] = None
+    value: Optional[float] = None
+    url: Optional[str] = None
+    expires_at: Optional[str] = None  # ISO date (YYYY-MM-DD)
 
 
 # Known product to package mappings
@@ -39,6 +44,32 @@ KNOWN_PRODUCTS = [
     "FlipECommerce",
 ]
 
+# Structured field patterns, compiled once and applied at ingest time.
+# Codes must follow a "code" label (optionally on the next line) and look
+# like an actual code: uppercase letters, digits, underscores or dashes.
+CODE_PATTERN = re.compile(
+    r"(?i:\b(?:access|promo|discount|coupon|invite|referral)?\s*code)\s*:?[ \t]*\n?[ \t]*"
+    r"\b([A-Z0-9][A-Z0-9_-]{3,})\b"
+)
+VALUE_PATTERN = re.compile(r"\$\s?(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?")
+URL_PATTERN = re.compile(r"https?://[^\s<>()\"']+")
+EXPIRY_PATTERN = re.compile(
+    r"(?i:\b(?:expires?(?:\s+on)?|expiring|valid\s+(?:until|through|thru)|"
+    r"ends?(?:\s+on)?|until|deadline))\s*:?\s*"
+    r"(\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|"
+    r"[A-Za-z]{3,9}\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}|"
+    r"\d{1,2}\s+[A-Za-z]{3,9}\.?,?\s+\d{4})"
+)
+ORDINAL_SUFFIX = re.compile(r"(?<=\d)(?:st|nd|rd|th)\b")
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%B %d %Y",
+    "%b %d %Y",
+    "%d %B %Y",
+    "%d %b %Y",
+]
+
 
 def clean_line(line: str) -> str:
     """Remove unicode control characters and invisible chars from a line."""
@@ -88,8 +119,43 @@ def parse_seed_file(content: str) -> list[Deal]:
     return deals
 
 
+def extract_code(raw_text: str) -> Optional[str]:
+    """Extract an access/promo code from deal text."""
+    match = CODE_PATTERN.search(raw_text)
+    return match.group(1) if match else None
+
+
+def extract_value(raw_text: str) -> Optional[float]:
+    """Extract the first dollar amount from deal text."""
+    match = VALUE_PATTERN.search(raw_text)
+    if not match:
+        return None
+    dollars, cents = match.groups()
+    return float(dollars.replace(",", "") + "." + (cents or "0"))
+
+
+def extract_url(raw_text: str) -> Optional[str]:
+    """Extract the first URL from deal text."""
+    match = URL_PATTERN.search(raw_text)
+    return match.group(0).rstrip(".,;:!?") if match else None
+
+
+def extract_expiry(raw_text: str) -> Optional[str]:
+    """Extract an expiry date from deal text as an ISO date string."""
+    for match in EXPIRY_PATTERN.finditer(raw_text):
+        date_text = ORDINAL_SUFFIX.sub("", match.group(1))
+        date_text = date_text.replace(",", " ").replace(".", " ")
+        date_text = " ".join(date_text.split())
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(date_text, fmt).date().isoformat()
+            except ValueError:
+                continue
+    return None
+
+
 def create_deal(product_name: str, raw_text: str) -> Deal:
-    """Create a deal with package mapping lookup."""
+    """Create a deal with package mapping lookup and structured fields."""
     product_key = product_name.lower().replace(' ', '').replace('-', '')
     package_info = PRODUCT_TO_PACKAGE.get(product_key, {})
 
@@ -98,4 +164,8 @@ def create_deal(product_name: str, raw_text: str) -> Deal:
         raw_text=raw_text,
         package_name=package_info.get("package"),
         package_manager=package_info.get("manager"),
+        code=extract_code(raw_text),
+        value=extract_value(raw_text),
+        url=extract_url(raw_text),
+        expires_at=extract_expiry(raw_text),
     )
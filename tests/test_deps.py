@@ -0,0 +1,41 @@
+"""Tests for dependency graphs and new-dependency detection."""
+
+from cli_saver.deps import python_dependency_graph
+from cli_saver.managers import get_manager
+
+
+def make_dist(site_dir, name, requires=()):
+    """Write a minimal installed distribution into a site-packages dir."""
+    dist_info = site_dir / f"{name}-1.0.dist-info"
+    dist_info.mkdir()
+    lines = ["Metadata-Version: 2.1", f"Name: {name}", "Version: 1.0"]
+    lines += [f"Requires-Dist: {requirement}" for requirement in requires]
+    (dist_info / "METADATA").write_text("\n".join(lines) + "\n")
+
+
+def test_conditional_requirements_are_skipped(tmp_path):
+    make_dist(tmp_path, "alpha", [
+        "beta",
+        'legacy; python_version < "3"',
+        'docs-tool; extra == "docs"',
+        'gamma; python_version >= "3"',
+    ])
+    make_dist(tmp_path, "beta")
+    make_dist(tmp_path, "gamma")
+
+    graph = python_dependency_graph([str(tmp_path)])
+
+    assert graph["alpha"] == {"beta", "gamma"}
+
+
+def test_new_dependencies_only_counts_installed_names():
+    pip = get_manager("pip")
+    before = {"beta": set()}
+    after = {
+        "alpha": {"beta", "gamma", "colorama"},
+        "beta": set(),
+        "gamma": {"delta"},
+        "delta": set(),
+    }
+
+    assert pip.new_dependencies(["alpha"], before, after) == ["delta", "gamma"]
@@ -0,0 +1,59 @@
+"""Tests for package manager plugins and the deal lookup keys they produce."""
+
+import pytest
+
+from cli_saver.managers import BUILTIN_MANAGERS, get_manager
+from cli_saver_deals_agent.database import find_top_deals, init_db, insert_deal
+
+
+# (manager, name the deal is stored under, install arguments)
+CASES = [
+    ("pip", "python_dotenv", ["install", "-U", "Python.Dotenv[cli]>=1.0"]),
+    ("uv", "python_dotenv", ["pip", "install", "python-dotenv"]),
+    ("pipx", "python_dotenv", ["install", "python_dotenv"]),
+    ("poetry", "python_dotenv", ["add", "--group", "dev", "python-dotenv@^1.0"]),
+    ("npm", "@scope/pkg", ["install", "--save-dev", "@scope/pkg@1.2.3"]),
+    ("pnpm", "@scope/pkg", ["add", "-F", "web", "@Scope/Pkg"]),
+    ("yarn", "left-pad", ["global", "add", "left-pad@1.3.0"]),
+    ("brew", "wget", ["install", "homebrew/core/wget"]),
+    ("cargo", "serde_json", ["add", "serde_json@1.0", "--features", "std"]),
+]
+
+
+def test_every_builtin_manager_is_covered():
+    assert {manager for manager, _, _ in CASES} == set(BUILTIN_MANAGERS)
+
+
+@pytest.mark.parametrize("manager_name, stored_name, args", CASES, ids=[case[0] for case in CASES])
+def test_install_arguments_find_stored_deal(tmp_path, manager_name, stored_name, args):
+    conn = init_db(tmp_path / "deals.db")
+    insert_deal(conn, "Product", "$100 in credits", package_name=stored_name, package_manager=manager_name)
+
+    packages = get_manager(manager_name).extract_packages(args)
+    deals = find_top_deals(conn, packages)
+    conn.close()
+
+    assert len(packages) == 1
+    assert [deal["product_name"] for deal in deals[packages[0]]] == ["Product"]
+
+
+@pytest.mark.parametrize("args", [
+    ["install", "."],
+    ["install", ".[dev]"],
+    ["install", "-e", ".[dev,test]"],
+    ["install", "..[all]"],
+    ["install", "./vendor/pkg"],
+    ["install", "-r", "requirements.txt"],
+    ["install", "dist/pkg-1.0-py3-none-any.whl"],
+])
+def test_pip_skips_local_paths(args):
+    assert get_manager("pip").extract_packages(args) == []
+
+
+def test_poetry_skips_local_paths():
+    assert get_manager("poetry").extract_packages(["add", ".[dev]", "../lib"]) == []
+
+
+def test_npm_skips_non_registry_specs():
+    npm = get_manager("npm")
+    assert npm.extract_packages(["install", "user/repo", "./local", "@scope", "lodash.merge"]) == ["lodash.merge"]
@@ -0,0 +1,200 @@
+"""Tests for deals database schema migrations and the read-only path."""
+
+import sqlite3
+
+import pytest
+
+from cli_saver_deals_agent.database import (
+    SCHEMA_VERSION,
+    find_deal_by_package,
+    find_top_deals,
+    init_db,
+    insert_deal,
+    migrate,
+    open_readonly,
+)
+
+
+# The schema as first released: free text only
+BASELINE_DDL = [
+    """
+    CREATE TABLE deals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_name TEXT NOT NULL,
+        package_name TEXT,
+        package_manager TEXT,
+        raw_text TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX idx_package_name ON deals(package_name)",
+    """
+    INSERT INTO deals (product_name, package_name, package_manager, raw_text)
+    VALUES ('Acme', 'acme', 'pip', '$100 in credits, expires 2099-01-01')
+    """,
+]
+
+# The last unversioned schema (user_version 0), with ranking and layers
+UNVERSIONED_DDL = [
+    """
+    CREATE TABLE deals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_name TEXT NOT NULL,
+        package_name TEXT,
+        package_manager TEXT,
+        raw_text TEXT NOT NULL,
+        code TEXT,
+        value REAL,
+        url TEXT,
+        expires_at TEXT,
+        raw_text_z BLOB,
+        dict_id INTEGER,
+        package_key TEXT,
+        score REAL,
+        created_at REAL
+    )
+    """,
+    "CREATE TABLE deal_dictionaries (id INTEGER PRIMARY KEY AUTOINCREMENT, data BLOB NOT NULL)",
+    "CREATE INDEX idx_package_name ON deals(package_name)",
+    "CREATE INDEX idx_package_manager ON deals(package_manager COLLATE NOCASE)",
+    "CREATE INDEX idx_product_name ON deals(product_name)",
+    "CREATE INDEX idx_product_name_nocase ON deals(product_name COLLATE NOCASE)",
+    "CREATE INDEX idx_package_key_score ON deals(package_key, score DESC)",
+    "CREATE INDEX idx_value ON deals(value)",
+    "CREATE INDEX idx_expires_at ON deals(expires_at)",
+    """
+    INSERT INTO deals (
+        product_name, package_name, package_manager, raw_text,
+        value, expires_at, package_key, score, created_at
+    )
+    VALUES ('Acme', 'acme', 'pip', '$100 in credits, expires 2099-01-01',
+            100.0, '2099-01-01', 'acme', 8.0, 1760000000.0)
+    """,
+]
+
+
+def build_db(path, statements):
+    """Create a database from raw SQL, the way an older release would have."""
+    conn = sqlite3.connect(path)
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def describe(path):
+    """Get (user_version, deals columns, index names) of a database."""
+    conn = sqlite3.connect(path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(deals)")}
+    indexes = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_%'"
+        )
+    }
+    conn.close()
+    return version, columns, indexes
+
+
+@pytest.fixture
+def current_db(tmp_path):
+    """A database created by this version, with one deal in it."""
+    path = tmp_path / "current.db"
+    conn = init_db(path)
+    insert_deal(conn, "Acme", "$100 in credits", package_name="acme", package_manager="pip", value=100.0)
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.mark.parametrize("statements", [BASELINE_DDL, UNVERSIONED_DDL], ids=["baseline", "unversioned"])
+def test_upgrade_matches_fresh_schema(tmp_path, current_db, statements):
+    path = build_db(tmp_path / "old.db", statements)
+
+    conn = init_db(path)
+    try:
+        deal = find_deal_by_package(conn, "acme")
+        active = find_top_deals(conn, ["acme"], active_on="2026-01-01")
+    finally:
+        conn.close()
+
+    version, columns, indexes = describe(path)
+    _, fresh_columns, fresh_indexes = describe(current_db)
+    assert version == SCHEMA_VERSION
+    assert columns == fresh_columns
+    assert indexes == fresh_indexes
+
+    assert deal["product_name"] == "Acme"
+    assert deal["value"] == 100.0
+    assert deal["expires_at"] == "2099-01-01"
+    assert [d["product_name"] for d in active["acme"]] == ["Acme"]
+
+
+def test_upgrade_backfills_fields_before_ranking(tmp_path):
+    path = build_db(tmp_path / "old.db", BASELINE_DDL + [
+        """
+        INSERT INTO deals (product_name, package_name, package_manager, raw_text)
+        VALUES ('Stale', 'acme', 'pip', '$500 in credits, expires 2020-01-01')
+        """,
+    ])
+
+    conn = init_db(path)
+    try:
+        ranked = find_top_deals(conn, ["acme"], k=None)["acme"]
+        active = find_top_deals(conn, ["acme"], k=None, active_on="2026-01-01")["acme"]
+    finally:
+        conn.close()
+
+    # The expired deal is worth more but ranks last, and isn't active
+    assert [d["product_name"] for d in ranked] == ["Acme", "Stale"]
+    assert [d["product_name"] for d in active] == ["Acme"]
+
+
+def test_open_readonly_does_not_touch_current_database(current_db):
+    before = current_db.stat().st_mtime_ns
+
+    conn = open_readonly(current_db)
+    try:
+        assert find_deal_by_package(conn, "acme")["product_name"] == "Acme"
+        assert find_top_deals(conn, ["acme", "missing"]).keys() == {"acme"}
+    finally:
+        conn.close()
+
+    assert current_db.stat().st_mtime_ns == before
+
+
+def test_open_readonly_migrates_old_database_once(tmp_path):
+    path = build_db(tmp_path / "old.db", BASELINE_DDL)
+
+    conn = open_readonly(path)
+    try:
+        assert find_deal_by_package(conn, "acme")["product_name"] == "Acme"
+    finally:
+        conn.close()
+
+    assert describe(path)[0] == SCHEMA_VERSION
+
+
+def test_readonly_connection_rejects_writes(current_db):
+    conn = open_readonly(current_db)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            insert_deal(conn, "Other", "$5 in credits", package_name="other")
+    finally:
+        conn.close()
+
+
+def test_migrate_refuses_newer_database(current_db):
+    conn = sqlite3.connect(current_db)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    conn.close()
+
+    conn = sqlite3.connect(current_db)
+    try:
+        with pytest.raises(sqlite3.DatabaseError, match="newer"):
+            migrate(conn)
+    finally:
+        conn.close()
+
+    with pytest.raises(sqlite3.DatabaseError, match="newer"):
+        init_db(current_db)